@@ -0,0 +1,11 @@
+"""
+app, the Pace & Time Calculator package
+
+The calculation core (calculatormethods and the headless cli) is pure Python and
+does not import PyQt5. The GUI modules (mainwindow, calculators, ptlogging and
+ptwidgets) are only loaded when they are imported, or when the application is
+started with ``python -m app``.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
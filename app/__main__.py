@@ -0,0 +1,16 @@
+"""
+__main__.py, starts the GUI with python -m app
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+
+
+def main():
+    """Load the GUI layer only when the application is started."""
+    from .mainwindow import main as gui_main
+    gui_main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+calculatorcache.py, opt-in LRU cache for pace, time and distance calculations
+
+Inputs are converted to seconds and distances before the lookup, so '5:00', '05:00'
+and '300' all share one cache entry.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+from functools import lru_cache
+
+from . import calculatormethods
+
+
+def _calculate(operation, first, second):
+    """Calculate and format a result from seconds and distances."""
+    if operation == 'pace':
+        return calculatormethods.calculate_pace(first, second)  # first = time, second = distance
+    elif operation == 'time':
+        return calculatormethods.calculate_time(first, second)  # first = pace, second = distance
+    else:
+        return calculatormethods.calculate_distance(first, second)  # first = time, second = pace
+
+
+class CalculatorCache:
+    """Bounded LRU cache in front of calculate_pace, calculate_time and calculate_distance."""
+    def __init__(self, maxsize=32768):  # room for the default prewarm chart
+        self._calculate = lru_cache(maxsize=maxsize)(_calculate)
+
+    def pace(self, time, distance):
+        """Calculate a pace from a timestamp and a distance."""
+        return self._calculate('pace', calculatormethods.convert_to_seconds(time), float(distance))
+
+    def time(self, pace, distance):
+        """Calculate an overall time from a pace timestamp and a distance."""
+        return self._calculate('time', calculatormethods.convert_to_seconds(pace), float(distance))
+
+    def distance(self, time, pace):
+        """Calculate a distance from an overall time and a pace timestamp."""
+        return self._calculate('distance', calculatormethods.convert_to_seconds(time),
+                               calculatormethods.convert_to_seconds(pace))
+
+    def prewarm(self, paces=range(180, 601), distances=None):
+        """Fill the cache with a pace chart: every pace (in seconds) against every distance.
+
+        Both directions are cached, the overall time for each pace and the pace for each overall time.
+        """
+        if distances is None:
+            distances = calculatormethods.STANDARD_DISTANCES.values()
+        distances = [float(distance) for distance in distances]
+        for pace in paces:
+            for distance in distances:
+                self._calculate('time', pace, distance)
+                self._calculate('pace', int(distance * pace), distance)
+
+    def info(self):
+        """Return the hits, misses, maximum size and current size of the cache."""
+        return self._calculate.cache_info()
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        self._calculate.cache_clear()
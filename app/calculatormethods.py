@@ -4,6 +4,95 @@ calculatormethods.py, contains calculation stuff for the buttons
 Pace & Time Calculator
 Created by Chad Timmermans (www.github.com/chadtimmermans)
 """
+from array import array
+from collections import namedtuple
+from decimal import ROUND_DOWN, ROUND_HALF_EVEN, Decimal
+from math import isfinite
+
+from . import fixedpoint
+from .metrics import METRICS
+
+
+# Result of a batch calculation: the values column, a valid mask (1 = valid, 0 = invalid),
+# and the formatted output column when requested (otherwise None).
+BatchResult = namedtuple('BatchResult', ['values', 'valid', 'formatted'])
+
+# Result of parsing a column of timestamps: the seconds column and the row numbers that failed to parse.
+ParsedColumn = namedtuple('ParsedColumn', ['seconds', 'errors'])
+
+# Status codes of the check_ functions, which report invalid input instead of raising CalculatorException.
+OK = 0
+BAD_FIELD_COUNT = 1  # more than three ':' separated fields
+BAD_NUMBER = 2  # a field that is empty or not a whole number (signs and spaces included), or not a finite number
+OUT_OF_RANGE = 3  # minutes or seconds of 60 or more after the first field, a warning: the value is still calculated
+NEGATIVE_RESULT = 4  # Left < Right
+DIVIDE_BY_ZERO = 5  # a distance or pace of 0
+TIME_LESS_THAN_PACE = 6  # less than one unit of distance
+
+# The message the GUI shows for each status, the same as the CalculatorException raised for it.
+MESSAGES = {
+    OK: '',
+    BAD_FIELD_COUNT: 'INVALID',
+    BAD_NUMBER: 'INVALID',
+    OUT_OF_RANGE: 'INVALID',
+    NEGATIVE_RESULT: 'Left < Right',
+    DIVIDE_BY_ZERO: 'Divide by 0',
+    TIME_LESS_THAN_PACE: 'Time < Pace',
+}
+
+# Result of a check_ function: a status code and the value, which is None unless the status is OK or OUT_OF_RANGE.
+Result = namedtuple('Result', ['status', 'value'])
+
+# Result of checking a column of timestamps: the seconds column and a status column.
+CheckedColumn = namedtuple('CheckedColumn', ['seconds', 'status'])
+
+# Standard race distances in kilometers, used for pace charts and cache prewarming.
+STANDARD_DISTANCES = {
+    '400m': 0.4,
+    '800m': 0.8,
+    '1K': 1.0,
+    '1500m': 1.5,
+    '1 Mile': 1.609344,
+    '2K': 2.0,
+    '3K': 3.0,
+    '2 Miles': 3.218688,
+    '5K': 5.0,
+    '8K': 8.0,
+    '5 Miles': 8.04672,
+    '10K': 10.0,
+    '15K': 15.0,
+    '10 Miles': 16.09344,
+    '20K': 20.0,
+    'Half Marathon': 21.0975,
+    '25K': 25.0,
+    '30K': 30.0,
+    'Marathon': 42.195,
+    '50K': 50.0,
+}
+
+# Rounding of every calculation, made exactly in integers: times are whole seconds and distances
+# whole millionths of a unit (fixedpoint.DISTANCE_SCALE), so a result only depends on its inputs.
+PACE_ROUNDING = ROUND_HALF_EVEN  # to whole seconds
+TIME_ROUNDING = ROUND_DOWN  # to whole seconds
+DISTANCE_ROUNDING = ROUND_HALF_EVEN  # to hundredths of a unit
+
+# int / int is correctly rounded, so round(a / b) rounds the exact ratio half to even while a is less than
+# EXACT: a tie is then exactly representable, and any other ratio is further from a tie than the rounding
+# error. The batch calculations use this instead of fixedpoint.divide, for times less than EXACT_SECONDS.
+EXACT = 2 ** 52
+EXACT_SECONDS = EXACT // fixedpoint.DISTANCE_SCALE  # about 142 years
+
+# Batch values are int64 columns, larger results (and inf or nan) are marked invalid instead of overflowing.
+LIMIT = float(2 ** 63)
+INFINITY = float('inf')
+INT64_MAX = fixedpoint.INT64_MAX
+
+# Timestamps of up to SAFE_LENGTH characters always fit into an int64 column (15 digits of seconds,
+# or hours times 3600, are far below INT64_MAX), longer ones are range checked row by row.
+SAFE_LENGTH = 15
+
+# Two digit fields 00 to 99, looked up while formatting so no new objects are built per timestamp.
+TWO_DIGITS = tuple(f'{number:02d}'.encode('ascii') for number in range(100))
 
 
 class CalculatorException(Exception):
@@ -32,26 +121,191 @@ def subtract_time(t1, t2):
         return seconds
 
 
+@METRICS.timed('compute.pace')
 def calculate_pace(time_in_seconds, distance):
     """Calculate a pace time using an overall time and the distance covered."""
-    pace_in_seconds = time_in_seconds / distance
-    pace_rounded = int(round(pace_in_seconds))
-    return convert_to_timestamp(int(pace_rounded))
+    distance_units = fixedpoint.to_distance_units(distance)
+    if distance_units == 0:
+        raise CalculatorException(msg='Divide by 0')
+    numerator, denominator = _ratio(time_in_seconds)
+    pace_in_seconds = fixedpoint.divide(numerator * fixedpoint.DISTANCE_SCALE, denominator * distance_units,
+                                        PACE_ROUNDING)
+    return convert_to_timestamp(pace_in_seconds)
 
 
+@METRICS.timed('compute.time')
 def calculate_time(pace_in_seconds, distance):
     """Calculate an overall time using a pace time and the distance covered."""
-    time_in_seconds = distance * pace_in_seconds
-    return convert_to_timestamp(int(time_in_seconds))
+    distance_units = fixedpoint.to_distance_units(distance)
+    numerator, denominator = _ratio(pace_in_seconds)
+    time_in_seconds = fixedpoint.divide(numerator * distance_units, denominator * fixedpoint.DISTANCE_SCALE,
+                                        TIME_ROUNDING)
+    return convert_to_timestamp(time_in_seconds)
 
 
+@METRICS.timed('compute.distance')
 def calculate_distance(time_in_seconds, pace_in_seconds):
     """Calculate the distance covered using an overall time and a pace."""
+    (time, time_denominator), (pace, pace_denominator) = _ratio(time_in_seconds), _ratio(pace_in_seconds)
+    if pace == 0:
+        raise CalculatorException(msg='Divide by 0')
     if time_in_seconds < pace_in_seconds:
         raise CalculatorException(msg='Time < Pace')
     else:
-        distance = time_in_seconds / pace_in_seconds
-        return f'{distance:.2f}'  # truncate to 2 decimal positions
+        hundredths = fixedpoint.divide(time * pace_denominator * 100, time_denominator * pace, DISTANCE_ROUNDING)
+        return f'{hundredths // 100}.{hundredths % 100:02d}'
+
+
+@METRICS.timed('compute.add_batch')
+def add_time_batch(left_in_seconds, right_in_seconds, formatted=False):
+    """Add two columns of seconds together.
+
+    Rows where the sum does not fit into the values column are marked invalid and given a sum of 0.
+    """
+    _check_lengths(left_in_seconds, right_in_seconds)
+    sums = [left + right for left, right in zip(left_in_seconds, right_in_seconds)]
+    valid = array('b', [1 if -LIMIT <= total < LIMIT else 0 for total in sums])
+    sums = array('q', [total if ok else 0 for total, ok in zip(sums, valid)])
+    return BatchResult(sums, valid, _format_column(sums, valid) if formatted else None)
+
+
+@METRICS.timed('compute.subtract_batch')
+def subtract_time_batch(left_in_seconds, right_in_seconds, formatted=False):
+    """Subtract a column of seconds from another.
+
+    Rows where Left < Right, or the difference does not fit into the values column, are marked
+    invalid and given a difference of 0.
+    """
+    _check_lengths(left_in_seconds, right_in_seconds)
+    differences = [left - right for left, right in zip(left_in_seconds, right_in_seconds)]
+    valid = array('b', [1 if 0 <= difference < LIMIT else 0 for difference in differences])
+    differences = array('q', [difference if ok else 0 for difference, ok in zip(differences, valid)])
+    return BatchResult(differences, valid, _format_column(differences, valid) if formatted else None)
+
+
+@METRICS.timed('compute.pace_batch')
+def calculate_pace_batch(times_in_seconds, distances, formatted=False):
+    """Calculate pace times for columns of overall times and distances, exactly like calculate_pace.
+
+    Rows with a distance of zero or less or that is not finite, or an overall time of EXACT_SECONDS
+    or more, are marked invalid and given a pace of 0.
+    """
+    _check_lengths(times_in_seconds, distances)
+    scale = fixedpoint.DISTANCE_SCALE
+    units = _distance_units(distances)
+    valid = array('b', [1 if unit > 0 and -EXACT_SECONDS < time < EXACT_SECONDS else 0
+                        for time, unit in zip(times_in_seconds, units)])
+    if _whole_seconds(times_in_seconds):
+        paces = array('q', [round(time * scale / unit) if ok else 0  # PACE_ROUNDING, see EXACT
+                            for time, unit, ok in zip(times_in_seconds, units, valid)])
+    else:
+        paces = array('q', [_divide_seconds(time, scale, unit, PACE_ROUNDING) if ok else 0
+                            for time, unit, ok in zip(times_in_seconds, units, valid)])
+    return BatchResult(paces, valid, _format_column(paces, valid) if formatted else None)
+
+
+@METRICS.timed('compute.time_batch')
+def calculate_time_batch(paces_in_seconds, distances, formatted=False):
+    """Calculate overall times for columns of pace times and distances, exactly like calculate_time.
+
+    Rows with a negative pace or distance, a distance that is not finite, or a time that does not
+    fit into the values column, are marked invalid and given a time of 0.
+    """
+    _check_lengths(paces_in_seconds, distances)
+    scale = fixedpoint.DISTANCE_SCALE
+    units = _distance_units(distances)
+    if _whole_seconds(paces_in_seconds):
+        products = [pace * unit // scale if 0 <= pace < LIMIT and unit >= 0 else -1  # TIME_ROUNDING, down
+                    for pace, unit in zip(paces_in_seconds, units)]
+    else:
+        products = [_divide_seconds(pace, unit, scale, TIME_ROUNDING) if 0 <= pace < LIMIT and unit >= 0 else -1
+                    for pace, unit in zip(paces_in_seconds, units)]
+    valid = array('b', [1 if 0 <= product < LIMIT else 0 for product in products])
+    times = array('q', [product if ok else 0 for product, ok in zip(products, valid)])
+    return BatchResult(times, valid, _format_column(times, valid) if formatted else None)
+
+
+@METRICS.timed('compute.distance_batch')
+def calculate_distance_batch(times_in_seconds, paces_in_seconds, formatted=False):
+    """Calculate distances for columns of overall times and pace times, exactly like calculate_distance.
+
+    Rows where Time < Pace, the pace is 0 or less, or the time or the distance is EXACT_SECONDS or
+    more, are marked invalid and given a distance of 0.
+    """
+    _check_lengths(times_in_seconds, paces_in_seconds)
+    valid = array('b', [1 if 0 < pace <= time < EXACT_SECONDS and time / pace < EXACT_SECONDS else 0
+                        for time, pace in zip(times_in_seconds, paces_in_seconds)])
+    if _whole_seconds(times_in_seconds) and _whole_seconds(paces_in_seconds):
+        distances = array('d', [round(time * 100 / pace) / 100 if ok else 0.0  # DISTANCE_ROUNDING, see EXACT
+                                for time, pace, ok in zip(times_in_seconds, paces_in_seconds, valid)])
+    else:
+        distances = array('d', [_divide_seconds(time, 100, pace, DISTANCE_ROUNDING) / 100 if ok else 0.0
+                                for time, pace, ok in zip(times_in_seconds, paces_in_seconds, valid)])
+    output = None
+    if formatted:
+        output = [f'{distance:.2f}' if ok else 'INVALID' for distance, ok in zip(distances, valid)]
+    return BatchResult(distances, valid, output)
+
+
+def _ratio(seconds):
+    """Return seconds as an exact (numerator, denominator) pair, fractions of a second included.
+
+    A float is taken as the decimal it prints as, so 300.9 seconds is 3009/10 and not the binary
+    fraction just below it.
+    """
+    if isinstance(seconds, int):
+        return seconds, 1
+    try:
+        return Decimal(repr(float(seconds))).as_integer_ratio()
+    except (TypeError, ValueError, OverflowError):  # not a number, nan or inf
+        raise CalculatorException
+
+
+def _divide_seconds(seconds, multiplier, divisor, rounding):
+    """Return seconds * multiplier / divisor rounded once, with the fractions of seconds and divisor."""
+    (numerator, denominator), (divisor, divisor_denominator) = _ratio(seconds), _ratio(divisor)
+    return fixedpoint.divide(numerator * multiplier * divisor_denominator, denominator * divisor, rounding)
+
+
+def _whole_seconds(column):
+    """Return True when every value of a column is an int, so the whole second fast paths are exact."""
+    if isinstance(column, array):
+        return column.typecode not in 'fd'
+    if isinstance(column, memoryview):
+        return column.format not in 'fd'
+    return set(map(type, column)) <= {int}
+
+
+def _distance_units(distances):
+    """Convert a column of distances into whole fixedpoint units, distances that are not finite become -1.
+
+    Each distinct distance is converted once, as result files repeat a few distances over many rows.
+    """
+    scale = fixedpoint.DISTANCE_SCALE
+    units = {distance: round(distance * scale) if -INFINITY < distance * scale < INFINITY else -1
+             for distance in set(distances)}
+    return list(map(units.__getitem__, distances))
+
+
+def _check_lengths(first, second):
+    """Make sure both columns of a batch calculation have the same number of rows."""
+    if len(first) != len(second):
+        raise CalculatorException(msg='Length mismatch')
+
+
+@METRICS.timed('format_column')
+def _format_column(seconds, valid):
+    """Convert a column of seconds into timestamps, marking invalid rows."""
+    text = format_timestamps(seconds).decode('ascii')  # format the whole column in one pass
+    timestamps = []
+    for offset, value, ok in zip(range(0, len(text), 8), seconds, valid):
+        if not ok:
+            timestamps.append('INVALID')
+        elif text[offset] == '*':  # 100 hours or more does not fit into a record
+            timestamps.append(convert_to_timestamp(value))
+        else:
+            timestamps.append(text[offset:offset + 8])
+    return timestamps
 
 
 def convert_to_seconds(timestamp):
@@ -70,13 +324,237 @@ def convert_to_seconds(timestamp):
                 seconds = int(position[1])
                 return minutes + seconds
         return int(timestamp)  # no colon, interpret as seconds
-    except:
+    except (AttributeError, TypeError, ValueError):
         raise CalculatorException
 
 
+@METRICS.timed('parse_column')
+def parse_timestamps(column):
+    """Convert a whole column of timestamps (HH:MM:SS, MM:SS or SS) into seconds.
+
+    The column is either a sequence of strings or a bytes buffer of newline separated timestamps.
+    Rows that can not be parsed are given 0 seconds and their row numbers are listed in the errors.
+    Minutes or seconds of 60 or more are added up like convert_to_seconds does.
+    """
+    rows, colon, is_number = _column_rows(column)
+    seconds = []
+    errors = []
+    append = seconds.append  # avoid the attribute lookup for every row
+    for index, row in enumerate(rows):
+        # The usual layouts (SS, MM:SS, H:MM:SS with two digit fields) are read as one number,
+        # e.g. 1:02:03 is 10203, and the colons are accounted for with the digits they follow.
+        digits = row.replace(colon, '')
+        if len(row) <= SAFE_LENGTH and is_number(digits):
+            colons = len(row) - len(digits)
+            if colons == 0:
+                append(int(row))
+                continue
+            number = int(digits)
+            if colons == 1 and len(row) > 3 and row[-3] == colon:
+                append(number - 40 * (number // 100))
+                continue
+            if colons == 2 and len(row) > 6 and row[-3] == colon and row[-6] == colon:
+                append(number - 40 * (number // 100) - 2400 * (number // 10000))
+                continue
+
+        # Fields are checked before they are converted, so invalid rows cost no more than valid ones.
+        fields = row.split(colon)
+        count = len(fields)
+        value = -1
+        if count == 3:
+            hours, minutes, secs = fields
+            if is_number(hours) and is_number(minutes) and is_number(secs):
+                value = int(hours) * 3600 + int(minutes) * 60 + int(secs)
+        elif count == 2:
+            minutes, secs = fields
+            if is_number(minutes) and is_number(secs):
+                value = int(minutes) * 60 + int(secs)
+        elif count == 1:
+            if is_number(row):  # no colon, interpret as seconds
+                value = int(row)
+        if 0 <= value <= INT64_MAX:
+            append(value)
+        else:  # not a timestamp, or too large for the seconds column
+            errors.append(index)
+            append(0)
+    return ParsedColumn(array('q', seconds), errors)
+
+
+@METRICS.timed('check_column')
+def check_timestamps(column):
+    """Convert a whole column of timestamps into seconds, with a status code for every row.
+
+    Takes the same columns as parse_timestamps. Rows that can not be parsed are given 0 seconds,
+    rows that are OUT_OF_RANGE are added up like parse_timestamps does, and rows too large for the
+    seconds column are BAD_NUMBER.
+    """
+    rows, colon, is_number = _column_rows(column)
+    seconds = []
+    status = []
+    append = seconds.append
+    append_status = status.append
+    for row in rows:
+        fields = row.split(colon)
+        count = len(fields)
+        value = -1
+        if count == 3:
+            hours, minutes, secs = fields
+            if is_number(hours) and is_number(minutes) and is_number(secs):
+                minutes = int(minutes)
+                secs = int(secs)
+                value = int(hours) * 3600 + minutes * 60 + secs
+                row_status = OK if minutes < 60 and secs < 60 else OUT_OF_RANGE
+        elif count == 2:
+            minutes, secs = fields
+            if is_number(minutes) and is_number(secs):
+                secs = int(secs)
+                value = int(minutes) * 60 + secs
+                row_status = OK if secs < 60 else OUT_OF_RANGE
+        elif count == 1:
+            if is_number(row):
+                value = int(row)
+                row_status = OK
+        if 0 <= value <= INT64_MAX:
+            append(value)
+            append_status(row_status)
+        else:  # not a timestamp, or too large for the seconds column
+            append(0)
+            append_status(BAD_FIELD_COUNT if count > 3 else BAD_NUMBER)
+    return CheckedColumn(array('q', seconds), array('b', status))
+
+
+def _column_rows(column):
+    """Return the rows of a column of timestamps, the field separator and the check for a whole number field."""
+    if isinstance(column, (bytes, bytearray, memoryview)):
+        # Decoded straight from the buffer, latin-1 maps every byte to one character and has no
+        # decimals but 0-9. Lines end like bytes.splitlines() ends them, at \n, \r\n or \r.
+        text = str(column, 'latin-1')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        rows = text.split('\n')
+        if rows[-1] == '':  # after the last line ending, or an empty buffer
+            rows.pop()
+        return rows, ':', str.isdecimal
+    return column, ':', str.isdecimal  # exactly the digits int() accepts
+
+
+def _check_scalars(*timestamps):
+    """Check a few timestamps with check_timestamps, anything that is not a string is BAD_NUMBER."""
+    checked = check_timestamps([timestamp if isinstance(timestamp, str) else '' for timestamp in timestamps])
+    errors = [status for status in checked.status if status not in (OK, OUT_OF_RANGE)]
+    return checked.seconds, errors[0] if errors else max(checked.status)
+
+
+def _finite(*numbers):
+    """Return True when every number is an int or float that is not inf or nan, also in distance units."""
+    try:
+        return all(isinstance(number, (int, float)) and isfinite(float(number) * fixedpoint.DISTANCE_SCALE)
+                   for number in numbers)
+    except OverflowError:  # an int too large for a float
+        return False
+
+
+def check_timestamp(timestamp):
+    """Convert a timestamp (HH:MM:SS, MM:SS or SS) into seconds, returns a Result instead of raising."""
+    seconds, status = _check_scalars(timestamp)
+    return Result(status, seconds[0] if status in (OK, OUT_OF_RANGE) else None)
+
+
+def check_add(t1, t2):
+    """Add two timestamps, returns a Result with the timestamp instead of raising."""
+    seconds, status = _check_scalars(t1, t2)
+    if status not in (OK, OUT_OF_RANGE):
+        return Result(status, None)
+    return Result(status, convert_to_timestamp(seconds[0] + seconds[1]))
+
+
+def check_subtract(t1, t2):
+    """Subtract a timestamp from another, returns a Result with the timestamp instead of raising."""
+    seconds, status = _check_scalars(t1, t2)
+    if status not in (OK, OUT_OF_RANGE):
+        return Result(status, None)
+    if seconds[0] < seconds[1]:
+        return Result(NEGATIVE_RESULT, None)
+    return Result(status, convert_to_timestamp(seconds[0] - seconds[1]))
+
+
+def check_pace(time_in_seconds, distance):
+    """Calculate a pace like calculate_pace, returns a Result instead of raising."""
+    if not _finite(time_in_seconds, distance):
+        return Result(BAD_NUMBER, None)
+    if fixedpoint.to_distance_units(distance) == 0:
+        return Result(DIVIDE_BY_ZERO, None)
+    if time_in_seconds < 0 or distance < 0:
+        return Result(NEGATIVE_RESULT, None)
+    return Result(OK, calculate_pace(time_in_seconds, distance))
+
+
+def check_time(pace_in_seconds, distance):
+    """Calculate an overall time like calculate_time, returns a Result instead of raising."""
+    if not _finite(pace_in_seconds, distance):
+        return Result(BAD_NUMBER, None)
+    if pace_in_seconds < 0 or distance < 0:
+        return Result(NEGATIVE_RESULT, None)
+    return Result(OK, calculate_time(pace_in_seconds, distance))
+
+
+def check_distance(time_in_seconds, pace_in_seconds):
+    """Calculate a distance like calculate_distance, returns a Result instead of raising."""
+    if not _finite(time_in_seconds, pace_in_seconds):
+        return Result(BAD_NUMBER, None)
+    if pace_in_seconds == 0:
+        return Result(DIVIDE_BY_ZERO, None)
+    if pace_in_seconds < 0:
+        return Result(NEGATIVE_RESULT, None)
+    if time_in_seconds < pace_in_seconds:
+        return Result(TIME_LESS_THAN_PACE, None)
+    return Result(OK, calculate_distance(time_in_seconds, pace_in_seconds))
+
+
+def format_timestamps(seconds, out=None, short=False):
+    """Write a column of seconds as zero padded timestamps (HH:MM:SS, or MM:SS when short).
+
+    Every timestamp is a fixed width record of 8 bytes (5 when short) written into out, which can be
+    any writable buffer such as a bytearray or a NumPy 'S8' array. A new bytearray is used when out
+    is not given. Values that do not fit into a record are written as asterisks.
+    """
+    width = 5 if short else 8
+    limit = 6000 if short else 360000
+    if out is None:
+        out = bytearray(width * len(seconds))
+    digits = TWO_DIGITS
+    with memoryview(out) as buffer, buffer.cast('B') as view:
+        if len(view) < width * len(seconds):
+            raise CalculatorException(msg='Buffer too small')
+        offset = 0
+        for value in seconds:
+            if 0 <= value < limit:
+                minutes = value // 60
+                if short:
+                    view[offset:offset + 2] = digits[minutes]
+                    view[offset + 2] = 58  # ':'
+                    view[offset + 3:offset + 5] = digits[value - minutes * 60]
+                else:
+                    hours = minutes // 60
+                    view[offset:offset + 2] = digits[hours]
+                    view[offset + 2] = 58  # ':'
+                    view[offset + 3:offset + 5] = digits[minutes - hours * 60]
+                    view[offset + 5] = 58  # ':'
+                    view[offset + 6:offset + 8] = digits[value - minutes * 60]
+            else:
+                view[offset:offset + width] = b'*' * width
+            offset += width
+    return out
+
+
 def convert_to_timestamp(seconds):
-    """Convert seconds into a timestamp (HH:MM:SS)."""
-    minutes, seconds = divmod(seconds, 60)
+    """Convert seconds into a zero padded timestamp (HH:MM:SS), fractions of a second are dropped."""
+    try:
+        seconds = int(seconds)
+    except (TypeError, ValueError, OverflowError):  # not a number, nan or inf
+        raise CalculatorException
+    if 0 <= seconds < 360000:
+        return format_timestamps((seconds,)).decode('ascii')
+    minutes, seconds = divmod(seconds, 60)  # 100 hours or more does not fit into a record
     hours, minutes = divmod(minutes, 60)
-    time = f'{hours}:{minutes}:{seconds}'
-    return time
+    return f'{hours:02d}:{minutes:02d}:{seconds:02d}'
@@ -8,8 +8,19 @@ Created by Chad Timmermans (www.github.com/chadtimmermans)
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QHBoxLayout, QListWidget, QVBoxLayout
 
-import calculatormethods
-from ptwidgets import PTBox, PTButton, PTField, PTTitle, PTOutput
+from . import calculatormethods, expressions
+from .ptwidgets import PTBox, PTButton, PTField, PTTitle, PTOutput
+
+
+def arithmetic(operator, left_time, right_time):
+    """Add or subtract two timestamps, or multiply or divide a timestamp by a number."""
+    if operator == '+':
+        return calculatormethods.add_time(left_time, right_time)
+    elif operator == '-':
+        return calculatormethods.subtract_time(left_time, right_time)
+    elif operator in ('*', '/'):
+        return expressions.evaluate(f'{left_time} {operator} {right_time}')
+    return ''
 
 
 class PaceCalculator(QVBoxLayout):
@@ -38,9 +49,9 @@ class PaceCalculator(QVBoxLayout):
     def pace_clicked(self):
         """Convert a timestamp and use it with the distance to calculate a pace."""
         time = self.pace.first_field.text()
-        time_in_seconds = float(calculatormethods.convert_to_seconds(time))
-        distance = float(self.pace.second_field.text())
-        output = calculatormethods.calculate_pace(time_in_seconds, distance)
+        time_in_seconds = self.pace.first_field.parse()
+        distance = self.pace.second_field.text()
+        output = calculatormethods.calculate_pace(time_in_seconds, self.pace.second_field.parse())
 
         # Update the GUI and return the input/output values.
         self.pace.output.setText(output)
@@ -50,9 +61,9 @@ class PaceCalculator(QVBoxLayout):
     def time_clicked(self):
         """Convert a timestamp and use it with the distance to calculate an overall time."""
         pace = self.time.first_field.text()
-        pace_in_seconds = float(calculatormethods.convert_to_seconds(pace))
-        distance = float(self.time.second_field.text())
-        output = calculatormethods.calculate_time(pace_in_seconds, distance)
+        pace_in_seconds = self.time.first_field.parse()
+        distance = self.time.second_field.text()
+        output = calculatormethods.calculate_time(pace_in_seconds, self.time.second_field.parse())
 
         # Update the GUI and return the input/output values.
         self.time.output.setText(output)
@@ -62,9 +73,9 @@ class PaceCalculator(QVBoxLayout):
     def distance_clicked(self):
         """Convert the time and pace timestamps and calculate the distance."""
         time = self.distance.first_field.text()
-        time_in_seconds = float(calculatormethods.convert_to_seconds(time))
+        time_in_seconds = self.distance.first_field.parse()
         pace = self.distance.second_field.text()
-        pace_in_seconds = float(calculatormethods.convert_to_seconds(pace))
+        pace_in_seconds = self.distance.second_field.parse()
         output = calculatormethods.calculate_distance(time_in_seconds, pace_in_seconds)
 
         # Update the GUI and return the input/output values.
@@ -97,16 +108,19 @@ class TimeCalculator(QVBoxLayout):
 
         # Initialize the top layout.
         top = PTTitle(title='Time Calculator',
-                      info='Add or subtract time.')
+                      info='Add, subtract, multiply or divide time, or evaluate an expression.')
 
         # Initialize widgets for the middle layout.
         self.left_field = PTField(field='Time')
-        self.right_field = PTField(field='Time')
+        self.right_field = PTField(field='Operand')
         self.arithmetic_list = QListWidget()
-        self.arithmetic_list.setStyleSheet('font: bold 13px')
-        self.arithmetic_list.setFixedSize(45, 38)
+        self.arithmetic_list.setObjectName('arithmetic_list')
+        self.arithmetic_list.setFixedSize(45, 76)
         self.arithmetic_list.addItem('+')
         self.arithmetic_list.addItem('-')
+        self.arithmetic_list.addItem('*')
+        self.arithmetic_list.addItem('/')
+        self.arithmetic_list.setToolTip('For * and /, the right field is a number.')
         self.arithmetic_list.setCurrentRow(0)
 
         # Initialize middle layout and add the middle widgets.
@@ -120,6 +134,14 @@ class TimeCalculator(QVBoxLayout):
         self.calculate_button = PTButton()
         self.output = PTOutput('00:00:00')
 
+        # Initialize the expression layout, for more than two times at once.
+        self.expression_field = PTField(field='Expression')
+        self.evaluate_button = PTButton()
+        expression = QHBoxLayout()
+        expression.addWidget(self.expression_field)
+        expression.addWidget(self.evaluate_button)
+        expression.setAlignment(Qt.AlignCenter)
+
         # Initialize bottom layout and add the bottom widgets.
         bottom = QHBoxLayout()
         bottom.addWidget(self.calculate_button)
@@ -129,31 +151,14 @@ class TimeCalculator(QVBoxLayout):
         # Configure the main layout.
         self.addLayout(top)
         self.addLayout(middle)
+        self.addLayout(expression)
         self.addLayout(bottom)
         self.setAlignment(Qt.AlignCenter)
 
-    def button_clicked(self):
-        """Calculate button to either add or subtract time."""
-        # Collect the input.
-        left_time = self.left_field.text()
-        right_time = self.right_field.text()
-        operator = self.arithmetic_list.currentItem().text()
-        time = ''
-
-        # Add or subtract time.
-        if operator == '+':
-            time = calculatormethods.add_time(left_time, right_time)
-        elif operator == '-':
-            time = calculatormethods.subtract_time(left_time, right_time)
-
-        # Update the GUI and return the input/output values.
-        self.output.setText(time)
-        self.output.set_valid()
-        return operator, left_time, right_time, time
-
     def reset_widgets(self):
         """Reset all of the time calculator widgets."""
         self.left_field.clear()
         self.right_field.clear()
+        self.expression_field.clear()
         self.arithmetic_list.setCurrentRow(0)
         self.output.reset_widget()
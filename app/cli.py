@@ -0,0 +1,159 @@
+r"""
+cli.py, headless command line for the calculators
+
+Reads one calculation per record from stdin and writes the results to stdout, e.g.
+
+    printf 'pace,1:00:00,10\nadd,45:10,12:00\n' | python -m app.cli
+    printf '{"operation": "time", "first": "5:00", "second": "42.195"}\n' | python -m app.cli --format jsonl
+
+Operations are pace (time, distance), time (pace, distance), distance (time, pace),
+add (left, right), subtract (left, right), multiply (time, number) and divide (time, number).
+Records are streamed one at a time so input of any size runs in constant memory.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import argparse
+import csv
+import json
+import sys
+
+from . import calculatormethods, expressions
+from .calculatorcache import CalculatorCache
+from .calculatormethods import CalculatorException
+from .metrics import METRICS
+
+
+def run_pace(time, distance):
+    """Calculate a pace from a timestamp and a distance."""
+    return calculatormethods.calculate_pace(calculatormethods.convert_to_seconds(time), float(distance))
+
+
+def run_time(pace, distance):
+    """Calculate an overall time from a pace timestamp and a distance."""
+    return calculatormethods.calculate_time(calculatormethods.convert_to_seconds(pace), float(distance))
+
+
+def run_distance(time, pace):
+    """Calculate a distance from an overall time and a pace timestamp."""
+    time_in_seconds = calculatormethods.convert_to_seconds(time)
+    pace_in_seconds = calculatormethods.convert_to_seconds(pace)
+    return calculatormethods.calculate_distance(time_in_seconds, pace_in_seconds)
+
+
+def run_multiply(time, number):
+    """Multiply a timestamp by a number."""
+    return expressions.evaluate(f'{time} * {number}')
+
+
+def run_divide(time, number):
+    """Divide a timestamp by a number."""
+    return expressions.evaluate(f'{time} / {number}')
+
+
+OPERATIONS = {
+    'pace': run_pace,
+    'time': run_time,
+    'distance': run_distance,
+    'add': calculatormethods.add_time,
+    'subtract': calculatormethods.subtract_time,
+    'multiply': run_multiply,
+    'divide': run_divide,
+}
+
+
+def read_csv(stream):
+    """Yield (operation, first, second) records from CSV lines."""
+    for row in csv.reader(stream):
+        if row:  # skip blank lines
+            yield tuple(row + ['', ''])[:3]
+
+
+def read_jsonl(stream):
+    """Yield (operation, first, second) records from JSON lines."""
+    for line in stream:
+        if line.strip():  # skip blank lines
+            try:
+                record = json.loads(line)
+                yield str(record['operation']), str(record['first']), str(record['second'])
+            except (ValueError, KeyError, TypeError):
+                yield ('', '', '')  # reported as an invalid record
+
+
+def calculate(records, operations=OPERATIONS):
+    """Yield (operation, first, second, result, error) for each record."""
+    for operation, first, second in records:
+        try:
+            result = operations[operation.strip().lower()](first.strip(), second.strip())
+            yield operation, first, second, result, ''
+        except CalculatorException as ce:
+            METRICS.increment('cli.errors')
+            yield operation, first, second, '', str(ce)
+        except (ValueError, KeyError, ArithmeticError):  # ArithmeticError for zero, inf or tiny numbers
+            METRICS.increment('cli.errors')
+            yield operation, first, second, '', 'INVALID'
+        METRICS.increment('cli.records')
+
+
+def write_csv(results, stream):
+    """Write results as CSV lines: operation, first, second, result, error."""
+    writer = csv.writer(stream, lineterminator='\n')
+    for result in results:
+        writer.writerow(result)
+
+
+def write_jsonl(results, stream):
+    """Write results as JSON lines."""
+    for operation, first, second, result, error in results:
+        record = {'operation': operation, 'first': first, 'second': second}
+        if error:
+            record['error'] = error
+        else:
+            record['result'] = result
+        stream.write(json.dumps(record) + '\n')
+
+
+READERS = {'csv': read_csv, 'jsonl': read_jsonl}
+WRITERS = {'csv': write_csv, 'jsonl': write_jsonl}
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Stream pace, time, distance, add and subtract calculations '
+                                                 'from stdin to stdout.')
+    parser.add_argument('--format', choices=sorted(READERS), default='csv', help='input format (default: csv)')
+    parser.add_argument('--output', choices=sorted(WRITERS), help='output format (default: same as input)')
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help='cache this many pace, time and distance results (default: no cache)')
+    parser.add_argument('--prewarm', action='store_true', help='fill the cache with a standard pace chart first')
+    parser.add_argument('--metrics', metavar='PATH',
+                        help='write timers and counters to PATH when done (.prom for Prometheus, else JSON lines)')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='sample the stack while running and write folded stacks to PATH')
+    args = parser.parse_args(argv)
+
+    if args.metrics:
+        METRICS.enable()
+    if args.profile:
+        METRICS.start_profiler()
+
+    operations = OPERATIONS
+    cache = None
+    if args.cache_size > 0:
+        cache = CalculatorCache(maxsize=args.cache_size)
+        if args.prewarm:
+            cache.prewarm()
+        operations = dict(OPERATIONS, pace=cache.pace, time=cache.time, distance=cache.distance)
+
+    records = READERS[args.format](sys.stdin)
+    WRITERS[args.output or args.format](calculate(records, operations), sys.stdout)
+    if cache is not None:
+        print(f'cache: {cache.info()}', file=sys.stderr)
+    if args.profile:
+        METRICS.stop_profiler(args.profile)
+    if args.metrics:
+        METRICS.write(args.metrics)
+
+
+if __name__ == '__main__':
+    main()
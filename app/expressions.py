@@ -0,0 +1,87 @@
+"""
+expressions.py, time arithmetic with any number of operands
+
+Evaluates expressions such as ``1:02:03 + 45:10 * 3 - 12:00 / 2``. Every term is a
+timestamp (HH:MM:SS, MM:SS or SS) optionally multiplied or divided by plain numbers,
+and terms are added or subtracted. All timestamps are parsed in one batch and the
+terms are summed in a single pass with exact fractions, the total is rounded to whole
+seconds at the end.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import re
+from fractions import Fraction
+
+from . import calculatormethods
+from .calculatormethods import CalculatorException
+
+TOKEN = re.compile(r'\s*(?:([\d:.]+)|([-+*/]))')
+
+
+def tokenize(expression):
+    """Split an expression into operand and operator tokens."""
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = TOKEN.match(expression, position)
+        if match is None:
+            raise CalculatorException
+        tokens.append(match.group(1) or match.group(2))
+        position = match.end()
+    return tokens
+
+
+def evaluate_seconds(expression):
+    """Evaluate an expression and return the result in whole seconds."""
+    tokens = tokenize(expression)
+
+    # Operands alternate with operators: time (op number)* ((+|-) time (op number)*)*
+    if len(tokens) % 2 == 0:
+        raise CalculatorException
+    operands, operators = tokens[0::2], tokens[1::2]
+    if any(operand in '+-*/' for operand in operands) or any(operator not in '+-*/' for operator in operators):
+        raise CalculatorException
+
+    # Operands that start a term are timestamps, parse all of them in one batch.
+    starts = [0] + [index + 1 for index, operator in enumerate(operators) if operator in '+-']
+    parsed = calculatormethods.parse_timestamps([operands[index] for index in starts])
+    if parsed.errors:
+        raise CalculatorException
+
+    terms = []
+    for term, start in enumerate(starts):
+        value = Fraction(parsed.seconds[term])
+        index = start
+        while index < len(operators) and operators[index] in '*/':
+            try:
+                factor = Fraction(operands[index + 1])  # exact, a factor of any size cannot overflow
+            except ValueError:
+                raise CalculatorException
+            if operators[index] == '*':
+                value *= factor
+            elif factor == 0:
+                raise CalculatorException(msg='Divide by 0')
+            else:
+                value /= factor
+            index += 1
+        terms.append(-value if start and operators[start - 1] == '-' else value)
+
+    total = round(sum(terms))  # half to even, like round() on floats
+    if total < 0:
+        raise CalculatorException(msg='Negative time')
+    return total
+
+
+def evaluate(expression):
+    """Evaluate an expression and return the result as a timestamp."""
+    return calculatormethods.convert_to_timestamp(evaluate_seconds(expression))
+
+
+def sum_times(timestamps):
+    """Add a whole column of timestamps, e.g. lap times, and return the total as a timestamp."""
+    parsed = calculatormethods.parse_timestamps(timestamps)
+    if parsed.errors:
+        raise CalculatorException
+    return calculatormethods.convert_to_timestamp(sum(parsed.seconds))
@@ -0,0 +1,178 @@
+"""
+fixedpoint.py, sub-second times in exact integer ticks
+
+Times are whole numbers of ticks, hundredths of a second by default (scale=100) or
+thousandths with scale=1000, and distances are whole millionths of a unit, so adding,
+subtracting, and calculating pace, time and distance never drift. Every division rounds
+once, with one of the decimal module's rounding modes:
+
+    ROUND_HALF_EVEN  nearest, ties to even (like round(), used for paces and distances)
+    ROUND_HALF_UP    nearest, ties away from zero
+    ROUND_DOWN       toward zero (like int(), used for overall times)
+    ROUND_UP         away from zero
+
+The whole second calculations in calculatormethods are made with these integers and the
+rounding modes in calculatormethods.PACE_ROUNDING, TIME_ROUNDING and DISTANCE_ROUNDING.
+calculatormethods imports this module while it loads, so this module imports calculatormethods
+inside the functions that need it, never at the top.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+from array import array
+from decimal import ROUND_DOWN, ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_UP
+
+CENTISECONDS = 100
+MILLISECONDS = 1000
+DISTANCE_SCALE = 1000000  # distances are kept in millionths of a unit, so 1.609344 (a mile in km) is exact
+INT64_MAX = 2 ** 63 - 1  # the largest value of the int64 columns
+
+ROUNDING_MODES = (ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_DOWN, ROUND_UP)
+
+
+def divide(numerator, denominator, rounding=ROUND_HALF_EVEN):
+    """Divide two integers exactly and round the quotient to an integer."""
+    if denominator == 0:
+        from .calculatormethods import CalculatorException  # only here, divide is called for every row
+        raise CalculatorException(msg='Divide by 0')
+    negative = (numerator < 0) != (denominator < 0)
+    quotient, remainder = divmod(abs(numerator), abs(denominator))
+    if remainder:
+        if rounding == ROUND_UP:
+            quotient += 1
+        elif rounding == ROUND_HALF_UP:
+            quotient += 2 * remainder >= abs(denominator)
+        elif rounding == ROUND_HALF_EVEN:
+            twice = 2 * remainder
+            quotient += twice > abs(denominator) or (twice == abs(denominator) and quotient & 1)
+        elif rounding != ROUND_DOWN:
+            raise ValueError(f'rounding must be one of {", ".join(ROUNDING_MODES)}')
+    return -quotient if negative else quotient
+
+
+def to_distance_units(distance):
+    """Convert a distance (number or text) into whole millionths of a unit."""
+    return int(round(float(distance) * DISTANCE_SCALE))
+
+
+def parse(timestamp, scale=CENTISECONDS, rounding=ROUND_HALF_EVEN):
+    """Convert a timestamp with optional fraction (HH:MM:SS.ff, MM:SS.ff or SS.ff) into ticks."""
+    from .calculatormethods import CalculatorException
+    whole, _, fraction = timestamp.strip().partition('.')
+    position = whole.split(':')
+    if len(position) > 3 or not all(field.isdecimal() for field in position) or \
+            (fraction and not fraction.isdecimal()):  # isdecimal, exactly the digits int() accepts
+        raise CalculatorException
+    seconds = 0
+    for field in position:
+        seconds = seconds * 60 + int(field)
+    ticks = seconds * scale
+    if fraction:
+        ticks += divide(int(fraction) * scale, 10 ** len(fraction), rounding)
+    return ticks
+
+
+def parse_column(column, scale=CENTISECONDS, rounding=ROUND_HALF_EVEN):
+    """Convert a column of timestamps into ticks, invalid rows are 0 and listed in the errors."""
+    from .calculatormethods import CalculatorException, ParsedColumn
+    places = len(str(scale)) - 1
+    short_fractions = 10 ** places == scale  # fractions of up to places digits need no rounding
+    ticks = []
+    errors = []
+    append = ticks.append  # avoid the attribute lookup for every row
+    for index, timestamp in enumerate(column):
+        # Timestamps with two digit minutes and seconds are read as one number and the minutes and
+        # hours are taken back out, e.g. 1:02:03 is 10203 - 40 * 102 - 2400 * 1 = 3723 seconds.
+        whole, _, fraction = timestamp.partition('.') if '.' in timestamp else (timestamp, '', '')
+        digits = whole.replace(':', '')
+        if digits.isdecimal() and (not fraction or short_fractions and fraction.isdecimal() and
+                                   len(fraction) <= places):
+            colons = len(whole) - len(digits)
+            number = int(digits)
+            seconds = None
+            if colons == 0:
+                seconds = number
+            elif colons == 1 and len(whole) > 3 and whole[-3] == ':':
+                seconds = number - 40 * (number // 100)
+            elif colons == 2 and len(whole) > 6 and whole[-3] == whole[-6] == ':':
+                seconds = number - 40 * (number // 100) - 2400 * (number // 10000)
+            if seconds is not None:
+                value = seconds * scale
+                if fraction:
+                    value += int(fraction) * 10 ** (places - len(fraction))
+                if value <= INT64_MAX:
+                    append(value)
+                    continue
+        try:  # any other layout, e.g. 1:2:3, spaces or a fraction that needs rounding
+            value = parse(timestamp, scale, rounding)
+        except CalculatorException:
+            value = -1
+        if 0 <= value <= INT64_MAX:
+            append(value)
+        else:  # not a timestamp, or too large for the ticks column
+            errors.append(index)
+            append(0)
+    return ParsedColumn(array('q', ticks), errors)
+
+
+def format_ticks(ticks, scale=CENTISECONDS):
+    """Convert ticks into a zero padded timestamp (HH:MM:SS.ff) with one digit per decimal place of scale."""
+    from .calculatormethods import CalculatorException
+    if ticks < 0:
+        raise CalculatorException(msg='Negative time')
+    seconds, fraction = divmod(ticks, scale)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    places = len(str(scale)) - 1
+    if places:
+        return f'{hours:02d}:{minutes:02d}:{seconds:02d}.{fraction:0{places}d}'
+    return f'{hours:02d}:{minutes:02d}:{seconds:02d}'
+
+
+def calculate_pace(time_in_ticks, distance_units, rounding=ROUND_HALF_EVEN):
+    """Calculate a pace in ticks per unit from a time in ticks and a distance in millionths of a unit."""
+    return divide(time_in_ticks * DISTANCE_SCALE, distance_units, rounding)
+
+
+def calculate_time(pace_in_ticks, distance_units, rounding=ROUND_HALF_EVEN):
+    """Calculate an overall time in ticks from a pace in ticks per unit and a distance in millionths of a unit."""
+    return divide(pace_in_ticks * distance_units, DISTANCE_SCALE, rounding)
+
+
+def calculate_distance(time_in_ticks, pace_in_ticks, rounding=ROUND_HALF_EVEN):
+    """Calculate a distance in millionths of a unit from a time and a pace in ticks."""
+    from .calculatormethods import CalculatorException
+    if time_in_ticks < pace_in_ticks:
+        raise CalculatorException(msg='Time < Pace')
+    return divide(time_in_ticks * DISTANCE_SCALE, pace_in_ticks, rounding)
+
+
+def calculate_pace_batch(times_in_ticks, distance_units, rounding=ROUND_HALF_EVEN):
+    """Calculate paces for columns of times and distances, rows with a distance of 0 or less are invalid."""
+    from .calculatormethods import BatchResult, _check_lengths
+    _check_lengths(times_in_ticks, distance_units)
+    valid = array('b', [1 if distance > 0 else 0 for distance in distance_units])
+    paces = array('q', [divide(time * DISTANCE_SCALE, distance, rounding) if ok else 0
+                        for time, distance, ok in zip(times_in_ticks, distance_units, valid)])
+    return BatchResult(paces, valid, None)
+
+
+def calculate_time_batch(paces_in_ticks, distance_units, rounding=ROUND_HALF_EVEN):
+    """Calculate overall times for columns of paces and distances, negative rows are invalid."""
+    from .calculatormethods import BatchResult, _check_lengths
+    _check_lengths(paces_in_ticks, distance_units)
+    valid = array('b', [1 if pace >= 0 and distance >= 0 else 0
+                        for pace, distance in zip(paces_in_ticks, distance_units)])
+    times = array('q', [divide(pace * distance, DISTANCE_SCALE, rounding) if ok else 0
+                        for pace, distance, ok in zip(paces_in_ticks, distance_units, valid)])
+    return BatchResult(times, valid, None)
+
+
+def calculate_distance_batch(times_in_ticks, paces_in_ticks, rounding=ROUND_HALF_EVEN):
+    """Calculate distances for columns of times and paces, rows where Time < Pace are invalid."""
+    from .calculatormethods import BatchResult, _check_lengths
+    _check_lengths(times_in_ticks, paces_in_ticks)
+    valid = array('b', [1 if 0 < pace <= time else 0 for time, pace in zip(times_in_ticks, paces_in_ticks)])
+    distances = array('q', [divide(time * DISTANCE_SCALE, pace, rounding) if ok else 0
+                            for time, pace, ok in zip(times_in_ticks, paces_in_ticks, valid)])
+    return BatchResult(distances, valid, None)
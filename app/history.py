@@ -0,0 +1,131 @@
+"""
+history.py, persistent append-only history of calculations
+
+Every calculation is stored as a structured record in a SQLite file: the operation,
+both inputs and the output in seconds (or distance), the unit the distance was typed
+with, the text of an expression, and when it was made. Records are
+written in batches, the durability is tunable through SQLite's synchronous setting, and
+reading back is done a page at a time so large histories open instantly.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import sqlite3
+import time
+from collections import namedtuple
+
+from . import calculatormethods
+from .units import parse_distance
+
+Record = namedtuple('Record', ['id', 'created', 'operation', 'first', 'second', 'output', 'unit', 'expression'])
+
+# Log titles and the operation stored for them.
+OPERATIONS = {'Pace': 'pace', 'Time': 'time', 'Distance': 'distance', '+': 'add', '-': 'subtract',
+              '*': 'multiply', '/': 'divide', '=': 'evaluate'}
+TITLES = {operation: title for title, operation in OPERATIONS.items()}
+
+# Which of first, second and output are numbers (distances or factors), everything else is a timestamp.
+DISTANCES = {
+    'pace': (False, True, False),
+    'time': (False, True, False),
+    'distance': (False, False, True),
+    'add': (False, False, False),
+    'subtract': (False, False, False),
+    'multiply': (False, True, False),
+    'divide': (False, True, False),
+}
+
+SYNCHRONOUS = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+COLUMNS = ', '.join(Record._fields)
+
+
+class History:
+    """Append-only calculation history stored in a SQLite file."""
+    def __init__(self, path, batch_size=1, synchronous='NORMAL'):
+        if synchronous.upper() not in SYNCHRONOUS:
+            raise ValueError(f'synchronous must be one of {", ".join(SYNCHRONOUS)}')
+        self.batch_size = batch_size
+        self.pending = []
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(f'PRAGMA synchronous={synchronous.upper()}')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS history ('
+                                'id INTEGER PRIMARY KEY, created REAL, operation TEXT, '
+                                'first REAL, second REAL, output REAL, unit TEXT, expression TEXT)')
+        columns = [column[1] for column in self.connection.execute('PRAGMA table_info(history)')]
+        for column in ('unit', 'expression'):
+            if column not in columns:  # a history written before units or expressions were stored
+                self.connection.execute(f'ALTER TABLE history ADD COLUMN {column} TEXT')
+        self.connection.commit()
+
+    def record(self, operation, first, second, output, created=None, unit=None, expression=None):
+        """Queue a record, values in seconds or distance, and write the queue once it holds batch_size records."""
+        self.pending.append((time.time() if created is None else created, operation, first, second, output, unit,
+                             expression))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def record_entry(self, title, first, second, output):
+        """Queue a record from the text shown in the log."""
+        operation = OPERATIONS.get(title)
+        if operation is None:
+            return
+        if operation == 'evaluate':
+            self.record(operation, None, None, calculatormethods.convert_to_seconds(str(output)),
+                        expression=str(first))
+            return
+        values, unit = [], None
+        for value, is_distance in zip((first, second, output), DISTANCES[operation]):
+            if is_distance:
+                distance = parse_distance(str(value), default=None)  # keep the unit only when one was typed
+                values.append(distance.value)
+                unit = unit or distance.unit
+            else:
+                values.append(calculatormethods.convert_to_seconds(str(value)))
+        self.record(operation, *values, unit=unit)
+
+    def flush(self):
+        """Write all queued records."""
+        if self.pending:
+            with self.connection:
+                self.connection.executemany('INSERT INTO history (created, operation, first, second, output, unit, '
+                                            'expression) VALUES (?, ?, ?, ?, ?, ?, ?)', self.pending)
+            self.pending = []
+
+    def page(self, before=None, limit=100):
+        """Return up to limit records older than the record id before, newest first."""
+        self.flush()
+        if before is None:
+            rows = self.connection.execute(f'SELECT {COLUMNS} FROM history ORDER BY id DESC LIMIT ?', (limit,))
+        else:
+            rows = self.connection.execute(f'SELECT {COLUMNS} FROM history WHERE id < ? ORDER BY id DESC LIMIT ?',
+                                           (before, limit))
+        return [Record(*row) for row in rows]
+
+    def pages(self, limit=100):
+        """Yield pages of records from newest to oldest, reading each page only when it is needed."""
+        page = self.page(limit=limit)
+        while page:
+            yield page
+            page = self.page(before=page[-1].id, limit=limit)
+
+    def close(self):
+        """Write any queued records and close the file."""
+        self.flush()
+        self.connection.close()
+
+
+def format_record(record):
+    """Return the (title, first, second, output) log values of a record, inputs as they were typed."""
+    if record.operation == 'evaluate':
+        # an expression has no first or second, its text is stored in the expression column
+        return TITLES[record.operation], record.expression, '', calculatormethods.convert_to_timestamp(
+            int(record.output))
+    first, second, output = [f'{value:.10g}' if is_distance else calculatormethods.convert_to_timestamp(int(value))
+                             for value, is_distance in zip((record.first, record.second, record.output),
+                                                           DISTANCES[record.operation])]
+    if DISTANCES[record.operation][1]:
+        second += record.unit or ''
+    if DISTANCES[record.operation][2]:
+        output = f'{record.output:.2f}'
+    return TITLES[record.operation], first, second, output
@@ -0,0 +1,65 @@
+"""
+logstore.py, bounded storage for the calculation log
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+from collections import deque
+
+
+def format_entry(title, first, second, output):
+    """Format a log entry based on title."""
+    if 'Pace' in title:
+        #  output = pace, first = time, second = distance
+        return f'{output}  Pace   where   T={first}   &   D={second}'
+    elif 'Time' in title:
+        # output = time, first = pace, second = distance
+        return f'{output}  Time   where   P={first}   &   D={second}'
+    elif 'Distance' in title:
+        # output = distance, first = time, second = pace
+        return f'{output}  Distance   where   T={first}   &   P={second}'
+    elif '+' in title:
+        # output = left + right, first = left, second = right
+        return f'{output}  =  {first}  +  {second}'
+    elif '-' in title:
+        # output = left - right, first = left, second = right
+        return f'{output}  =  {first}  -  {second}'
+    elif '*' in title:
+        # output = left * right, first = left, second = right
+        return f'{output}  =  {first}  *  {second}'
+    elif '/' in title:
+        # output = left / right, first = left, second = right
+        return f'{output}  =  {first}  /  {second}'
+    elif '=' in title:
+        # output = first, an expression of any number of times
+        return f'{output}  =  {first}'
+    return None
+
+
+class LogStore:
+    """Ring buffer of log entries, newest first, holding at most max_entries."""
+    def __init__(self, max_entries=1000):
+        self.entries = deque(maxlen=max_entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        """Iterate over the entries from newest to oldest."""
+        return iter(self.entries)
+
+    def add(self, entry):
+        """Add an entry, return True when the oldest entry was dropped to make room."""
+        full = len(self.entries) == self.entries.maxlen
+        self.entries.appendleft(entry)
+        return full
+
+    def pop_latest(self):
+        """Remove and return the newest entry, or None when the store is empty."""
+        if self.entries:
+            return self.entries.popleft()
+        return None
+
+    def clear(self):
+        """Remove all entries."""
+        self.entries.clear()
@@ -1,55 +1,93 @@
-#!/usr/bin/env python3
 """
 mainwindow.py, main application
 
 Pace & Time Calculator
 Created by Chad Timmermans (www.github.com/chadtimmermans)
 """
+import os
 import sys
 from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QApplication, QGridLayout, QMainWindow, QWidget
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtWidgets import QApplication, QGridLayout, QHBoxLayout, QMainWindow, QShortcut, QWidget
 
-from calculatormethods import CalculatorException
-from calculators import PaceCalculator, TimeCalculator
-from logging import Logging
-from ptwidgets import PTButton
+from . import calculatormethods, expressions
+from .calculatormethods import CalculatorException
+from .calculators import PaceCalculator, TimeCalculator, arithmetic
+from .history import History
+from .metrics import METRICS
+from .ptlogging import Logging
+from .ptwidgets import STYLESHEET, PTButton
+from .squadtable import SquadTable
+from .workers import WorkerPool
 
 
 DEBUGGING = False  # Set to true for error output to terminal.
+LIVE_UPDATES = True  # Recalculate the pace calculator boxes while typing.
+# Calculation history, PACETIME_HISTORY moves it and an empty PACETIME_HISTORY turns it off.
+HISTORY_PATH = os.environ.get('PACETIME_HISTORY',
+                              os.path.join(os.path.expanduser('~'), '.pacetimecalculator_history.sqlite3')) or None
+METRICS_PATH = os.environ.get('PACETIME_METRICS')  # Collect timers and counters, written here on close (.prom or .jsonl).
+PROFILE_PATH = os.path.join(os.path.expanduser('~'), '.pacetimecalculator_profile.txt')
 
 
 class PaceTimeCalculator(QMainWindow):
-    """Main Window for PaceTimeCalculator application."""
-    def __init__(self, *args, **kwargs):
+    """Main Window for PaceTimeCalculator application, history_path=None keeps no history."""
+    def __init__(self, *args, history_path=HISTORY_PATH, **kwargs):
         super().__init__(*args, **kwargs)
 
         # Configure the main window.
         self.setWindowTitle('Pace & Time Calculator')
-        self.setStyleSheet('background: white;')
         self.move(100, 100)
+        if METRICS_PATH:
+            METRICS.enable()
 
         # Initialize and set the central widget.
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
 
         # Initialize GUI layouts for the calculators.
-        self.logging = Logging()
+        self.logging = Logging(history=None if history_path is None else History(history_path))
         self.time_calculator = TimeCalculator()
         self.pace_calculator = PaceCalculator()
 
-        # Initialize the reset button.
+        # Initialize the reset and squad table buttons.
         self.reset_button = PTButton('Reset Application')
+        self.squad_button = PTButton('Squad Table')
+        self.squad_button.setToolTip('Calculate paces for a whole squad of athletes.')
+        self.squad_table = None
+
+        # Calculations run on a thread pool, results and errors come back to the GUI thread.
+        self.workers = WorkerPool()
 
         # Connect calculator layout buttons.
         self.time_calculator.calculate_button.clicked.connect(self.time_calculator_button_clicked)
+        self.time_calculator.evaluate_button.clicked.connect(self.expression_button_clicked)
+        self.time_calculator.expression_field.returnPressed.connect(self.expression_button_clicked)
         self.pace_calculator.pace.calculate_button.clicked.connect(self.pace_button_clicked)
         self.pace_calculator.time.calculate_button.clicked.connect(self.time_button_clicked)
         self.pace_calculator.distance.calculate_button.clicked.connect(self.distance_button_clicked)
         self.logging.button_clear_all.clicked.connect(self.logging.clear_all)
         self.logging.button_clear_latest.clicked.connect(self.logging.clear_latest)
 
-        # Connect the reset button.
+        # Live updates only refresh the outputs, the log is still written by the calculate buttons.
+        if LIVE_UPDATES:
+            self.pace_calculator.pace.enable_live_updates(self.pace_calculator.pace_clicked)
+            self.pace_calculator.time.enable_live_updates(self.pace_calculator.time_clicked)
+            self.pace_calculator.distance.enable_live_updates(self.pace_calculator.distance_clicked)
+
+        # Connect the reset and squad table buttons.
         self.reset_button.clicked.connect(self.reset_application_button_clicked)
+        self.squad_button.clicked.connect(self.squad_button_clicked)
+
+        # Ctrl+Shift+P starts the sampling profiler, and pressing it again writes the samples to PROFILE_PATH.
+        self.profiler_shortcut = QShortcut(QKeySequence('Ctrl+Shift+P'), self)
+        self.profiler_shortcut.activated.connect(self.toggle_profiler)
+
+        # Horizontal box to hold the bottom buttons.
+        hbox_buttons = QHBoxLayout()
+        hbox_buttons.setAlignment(Qt.AlignCenter)
+        hbox_buttons.addWidget(self.reset_button)
+        hbox_buttons.addWidget(self.squad_button)
 
         # Initialize and configure the main layout.
         main_layout = QGridLayout()
@@ -57,54 +95,95 @@ class PaceTimeCalculator(QMainWindow):
         main_layout.addLayout(self.time_calculator, 0, 0, Qt.AlignCenter)
         main_layout.addLayout(self.pace_calculator, 1, 0, Qt.AlignCenter)
         main_layout.addLayout(self.logging, 2, 0, Qt.AlignCenter)
-        main_layout.addWidget(self.reset_button, 3, 0, Qt.AlignCenter)
+        main_layout.addLayout(hbox_buttons, 3, 0, Qt.AlignCenter)
 
         # Attach the main layout to the central widget.
         central_widget.setLayout(main_layout)
-        self.setFixedSize(500, 825)
+        self.setFixedSize(500, 870)
 
     def time_calculator_button_clicked(self):
         """Calculate button for TimeCalculator."""
-        try:
-            operator, left_time, right_time, time = self.time_calculator.button_clicked()
-            self.logging.add_to_log(operator, left_time, right_time, time)
-        except CalculatorException as ce:
-            self.time_calculator.output.set_invalid(str(ce))
-            if DEBUGGING:
-                raise
+        left_time = self.time_calculator.left_field.text()
+        right_time = self.time_calculator.right_field.text()
+        operator = self.time_calculator.arithmetic_list.currentItem().text()
+        self.calculate_in_background(operator, left_time, right_time, self.time_calculator.output,
+                                     arithmetic, operator, left_time, right_time)
+
+    def expression_button_clicked(self):
+        """Calculate button for the expression of TimeCalculator."""
+        expression = self.time_calculator.expression_field.text()
+        self.calculate_in_background('=', expression, '', self.time_calculator.output,
+                                     expressions.evaluate, expression)
 
     def pace_button_clicked(self):
         """"Convert timestamp and use with distance to calculate a pace."""
-        try:
-            time, distance, output = self.pace_calculator.pace_clicked()
-            self.logging.add_to_log('Pace', time, distance, output)
-        except CalculatorException as ce:
-            self.pace_calculator.pace.output.set_invalid(str(ce))
-            if DEBUGGING:
-                raise
+        self.calculate_box_in_background('Pace', self.pace_calculator.pace, calculatormethods.calculate_pace)
 
     def time_button_clicked(self):
         """Convert timestamp and use with distance to calculate overall time.."""
-        try:
-            pace, distance, output = self.pace_calculator.time_clicked()
-            self.logging.add_to_log('Time', pace, distance, output)
-        except CalculatorException as ce:
-            self.pace_calculator.time.output.set_invalid(str(ce))
-            if DEBUGGING:
-                raise
+        self.calculate_box_in_background('Time', self.pace_calculator.time, calculatormethods.calculate_time)
 
     def distance_button_clicked(self):
         """Convert timestamps and calculate distance."""
+        self.calculate_box_in_background('Distance', self.pace_calculator.distance,
+                                         calculatormethods.calculate_distance)
+
+    def calculate_box_in_background(self, title, box, calculate):
+        """Parse the fields of a pace calculator box and calculate from them on the worker pool."""
         try:
-            time, pace, output = self.pace_calculator.distance_clicked()
-            self.logging.add_to_log('Distance', time, pace, output)
+            first, second = box.first_field.parse(), box.second_field.parse()
         except CalculatorException as ce:
-            self.pace_calculator.distance.output.set_invalid(str(ce))
-            if DEBUGGING:
-                raise
+            self.show_error(box.output, ce)
+            return
+        self.calculate_in_background(title, box.first_field.text(), box.second_field.text(), box.output,
+                                     calculate, first, second)
+
+    def calculate_in_background(self, title, first, second, output, calculate, *args):
+        """Run calculate(*args) on the worker pool, then show the result in output and log it."""
+        def show_result(result):
+            output.setText(result)
+            output.set_valid()
+            self.logging.add_to_log(title, first, second, result)
+        self.workers.start(calculate, *args, on_result=show_result, on_error=lambda ce: self.show_error(output, ce))
+
+    def show_error(self, output, ce):
+        """Show the message of a CalculatorException in an output."""
+        output.set_invalid(str(ce))
+        if DEBUGGING:
+            raise ce
+
+    def toggle_profiler(self):
+        """Start the sampling profiler, or stop it and write its samples when it is running."""
+        if METRICS.profiler is None:
+            METRICS.start_profiler()
+            self.setWindowTitle('Pace & Time Calculator (profiling)')
+        else:
+            METRICS.stop_profiler(PROFILE_PATH)
+            self.setWindowTitle('Pace & Time Calculator')
+
+    def closeEvent(self, event):
+        """Stop the calculations, then write any queued history records, profiler samples and metrics."""
+        self.workers.cancel_all()
+        self.workers.wait()
+        if self.squad_table is not None:
+            self.squad_table.close()
+        if self.logging.history is not None:
+            self.logging.history.close()
+        METRICS.stop_profiler(PROFILE_PATH)
+        if METRICS_PATH:
+            METRICS.write(METRICS_PATH)
+        super().closeEvent(event)
+
+    def squad_button_clicked(self):
+        """Open the squad table window, created the first time it is needed."""
+        if self.squad_table is None:
+            self.squad_table = SquadTable()
+        self.squad_table.show()
+        self.squad_table.raise_()
 
     def reset_application_button_clicked(self):
         """Reset the application and all gui components."""
+        self.workers.cancel_all()
         self.time_calculator.reset_widgets()
         self.pace_calculator.reset_widgets()
         self.logging.clear_all()
@@ -113,6 +192,7 @@ class PaceTimeCalculator(QMainWindow):
 def main():
     """PaceTimeCalculator application entry point."""
     app = QApplication(sys.argv)
+    app.setStyleSheet(STYLESHEET)
     win = PaceTimeCalculator()
     win.show()
     sys.exit(app.exec_())
@@ -0,0 +1,268 @@
+"""
+metrics.py, timers, counters and a sampling profiler for the calculator stack
+
+Parsing, calculating, formatting, log rendering and widget updates are wrapped with
+METRICS.timed(), which only checks a flag while metrics are disabled (the default).
+Once enabled, every call is counted and timed, and the totals can be written as JSON
+lines or in the Prometheus text format:
+
+    from app.metrics import METRICS
+    METRICS.enable()
+    ...
+    METRICS.write('metrics.prom')  # or metrics.jsonl
+
+The sampling profiler records the stack of one thread every few milliseconds and can be
+started and stopped at any time. Its output is the folded stack format read by
+flamegraph.pl and speedscope.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from time import perf_counter
+
+PREFIX = 'pacetime_'
+
+
+class _Timer:
+    """Context manager that adds the time spent inside it to a timer."""
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, perf_counter() - self.start)
+
+
+class _NullTimer:
+    """Context manager that does nothing, used while metrics are disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """Named counters and timers, collected only while enabled.
+
+    Counters and timers are updated from the GUI thread and the worker pool at once, so every
+    update and every copy for the exporters holds a lock.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.counters = {}
+        self.timers = {}  # name: [calls, total seconds, longest call in seconds]
+        self.profiler = None
+        self._lock = threading.Lock()
+
+    def enable(self):
+        """Start collecting."""
+        self.enabled = True
+
+    def disable(self):
+        """Stop collecting, the values collected so far are kept."""
+        self.enabled = False
+
+    def reset(self):
+        """Remove all counters and timers."""
+        with self._lock:
+            self.counters.clear()
+            self.timers.clear()
+
+    def increment(self, name, amount=1):
+        """Add amount to a counter."""
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, seconds):
+        """Add one call that took seconds to a timer."""
+        with self._lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                self.timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                if seconds > timer[2]:
+                    timer[2] = seconds
+
+    def timer(self, name):
+        """Return a context manager that times its block."""
+        return _Timer(self, name) if self.enabled else NULL_TIMER
+
+    def timed(self, name):
+        """Decorator that times every call of a function."""
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.observe(name, perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def _copy(self):
+        """Return copies of the counters and of the timers, taken together."""
+        with self._lock:
+            return dict(self.counters), {name: tuple(timer) for name, timer in self.timers.items()}
+
+    def snapshot(self):
+        """Return a copy of the counters and timers as {'counters': {...}, 'timers': {...}}."""
+        counters, timers = self._copy()
+        return {
+            'counters': counters,
+            'timers': {name: {'calls': calls, 'total': total, 'max': longest}
+                       for name, (calls, total, longest) in timers.items()},
+        }
+
+    def to_jsonl(self, timestamp=None):
+        """Return one JSON line per counter and timer."""
+        timestamp = time.time() if timestamp is None else timestamp
+        counters, timers = self._copy()
+        lines = [json.dumps({'time': timestamp, 'type': 'counter', 'name': name, 'value': value})
+                 for name, value in sorted(counters.items())]
+        lines += [json.dumps({'time': timestamp, 'type': 'timer', 'name': name,
+                              'calls': calls, 'total': total, 'max': longest})
+                  for name, (calls, total, longest) in sorted(timers.items())]
+        return ''.join(line + '\n' for line in lines)
+
+    def to_prometheus(self):
+        """Return the counters and timers in the Prometheus text exposition format."""
+        lines = []
+        counters, timers = self._copy()
+        for name, value in sorted(counters.items()):
+            metric = _metric_name(name) + '_total'
+            lines += [f'# TYPE {metric} counter', f'{metric} {value}']
+        for name, (calls, total, longest) in sorted(timers.items()):
+            metric = _metric_name(name) + '_seconds'
+            lines += [f'# TYPE {metric} summary', f'{metric}_count {calls}', f'{metric}_sum {total:.9f}',
+                      f'# TYPE {metric}_max gauge', f'{metric}_max {longest:.9f}']
+        return ''.join(line + '\n' for line in lines)
+
+    def write(self, path):
+        """Write the metrics to path, in the Prometheus format for .prom files and as JSON lines otherwise.
+
+        JSON lines are appended, so repeated writes build up a time series. A Prometheus file is replaced.
+        """
+        if path.endswith('.prom'):
+            with open(path, 'w') as file:
+                file.write(self.to_prometheus())
+        else:
+            with open(path, 'a') as file:
+                file.write(self.to_jsonl())
+
+    def start_profiler(self, interval=0.005, thread=None):
+        """Start sampling the stack of thread (the calling thread by default)."""
+        if self.profiler is None:
+            self.profiler = SamplingProfiler(interval, thread)
+            self.profiler.start()
+        return self.profiler
+
+    def stop_profiler(self, path=None):
+        """Stop the sampling profiler, write its samples to path when given and return it."""
+        profiler, self.profiler = self.profiler, None
+        if profiler is not None:
+            profiler.stop()
+            if path is not None:
+                profiler.write(path)
+        return profiler
+
+
+class SamplingProfiler:
+    """Counts the stacks of one thread, sampled every interval seconds.
+
+    The main thread is sampled with a CPU time interval timer where the platform has one
+    (signal.setitimer), so samples land wherever the thread is running. Other threads, and
+    platforms without setitimer, are sampled from a background thread, which can only take a
+    sample when the profiled thread releases the GIL, so I/O is over-represented.
+    """
+    def __init__(self, interval=0.005, thread=None):
+        self.interval = interval
+        self.thread_id = (thread or threading.current_thread()).ident
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._previous_handler = None
+        self._uses_timer = False
+
+    def start(self):
+        """Start sampling."""
+        if hasattr(signal, 'setitimer') and self.thread_id == threading.main_thread().ident and \
+                threading.current_thread() is threading.main_thread():
+            self._uses_timer = True
+            self._previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+            return
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._run, name='SamplingProfiler', daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        """Stop sampling, waiting for the sampling thread to finish when there is one."""
+        if self._uses_timer:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+            self._uses_timer = False
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def _on_signal(self, signum, frame):
+        self._record(frame)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:  # the thread has finished
+                return
+            self._record(frame)
+
+    def _record(self, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+            frame = frame.f_back
+        self.samples[';'.join(reversed(stack))] += 1
+
+    def to_folded(self):
+        """Return the samples in the folded stack format, one 'outer;...;inner count' line per stack."""
+        return ''.join(f'{stack} {count}\n' for stack, count in self.samples.most_common())
+
+    def write(self, path):
+        """Write the samples to path in the folded stack format."""
+        with open(path, 'w') as file:
+            file.write(self.to_folded())
+
+
+def _metric_name(name):
+    """Convert a name such as 'compute.pace' into a Prometheus metric name."""
+    return PREFIX + ''.join(char if char.isalnum() else '_' for char in name)
+
+
+METRICS = Metrics()
@@ -0,0 +1,106 @@
+"""
+pacechart.py, precomputed pace charts
+
+A pace chart holds the overall time, in whole seconds, for every pace in a range
+against a list of distances. The grid is calculated in one batch pass, kept as a
+flat int32 table (one row per pace), and can be saved to a file that is loaded
+again through mmap, so a chart service can read any cell without recalculating.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import mmap
+import struct
+from array import array
+
+from . import calculatormethods
+from .calculatormethods import CalculatorException
+
+MAGIC = b'PTCHART1'
+
+# magic, first pace, pace step, rows, columns, length of the encoded distance names (native byte order)
+HEADER = struct.Struct('=8siiiiI')
+
+
+class PaceChart:
+    """Overall times for every pace (rows) against every distance (columns)."""
+    def __init__(self, first_pace, step, distances, table, source=None):
+        self.first_pace = first_pace
+        self.step = step
+        self.distances = distances  # (name, distance) pairs in column order
+        self.columns = {name: index for index, (name, _) in enumerate(distances)}
+        self.table = table  # flat int32 table, an array or a memoryview over a mapped file
+        self.rows = len(table) // len(distances) if distances else 0
+        self._source = source  # the mmap when the chart was loaded from a file
+
+    @classmethod
+    def build(cls, first_pace=180, last_pace=600, step=1, distances=None):
+        """Calculate a chart for paces first_pace to last_pace (seconds) against a name to distance mapping."""
+        if distances is None:
+            distances = calculatormethods.STANDARD_DISTANCES
+        distances = list(distances.items())
+        paces = range(first_pace, last_pace + 1, step)
+
+        # Every (pace, distance) cell goes through the batch calculation in one call.
+        columns = [distance for _, distance in distances]
+        times = calculatormethods.calculate_time_batch([pace for pace in paces for _ in columns],
+                                                       columns * len(paces))
+        return cls(first_pace, step, distances, array('i', times.values))
+
+    def row_index(self, pace):
+        """Return the row of a pace in seconds."""
+        index, remainder = divmod(pace - self.first_pace, self.step)
+        if remainder or not 0 <= index < self.rows:
+            raise CalculatorException(msg='Pace not in chart')
+        return index
+
+    def time(self, pace, name):
+        """Return the overall time in seconds for a pace in seconds and a distance name."""
+        try:
+            column = self.columns[name]
+        except KeyError:
+            raise CalculatorException(msg='Distance not in chart')
+        return self.table[self.row_index(pace) * len(self.distances) + column]
+
+    def timestamp(self, pace, name):
+        """Return the overall time as a timestamp for a pace in seconds and a distance name."""
+        return calculatormethods.convert_to_timestamp(self.time(pace, name))
+
+    def row(self, pace):
+        """Return the overall times for every distance of a pace in seconds."""
+        start = self.row_index(pace) * len(self.distances)
+        return self.table[start:start + len(self.distances)]
+
+    def save(self, path):
+        """Write the chart to a file that load() can map into memory."""
+        names = '\n'.join(name for name, _ in self.distances).encode('utf-8')
+        header = HEADER.pack(MAGIC, self.first_pace, self.step, self.rows, len(self.distances), len(names))
+        header += struct.pack(f'={len(self.distances)}d', *(distance for _, distance in self.distances)) + names
+        header += b'\0' * (-len(header) % 8)  # keep the table aligned
+        with open(path, 'wb') as chart_file:
+            chart_file.write(header)
+            chart_file.write(memoryview(self.table).cast('B'))
+
+    @classmethod
+    def load(cls, path):
+        """Map a saved chart into memory without reading or parsing the table."""
+        with open(path, 'rb') as chart_file:
+            source = mmap.mmap(chart_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, first_pace, step, rows, columns, names_length = HEADER.unpack_from(source)
+        if magic != MAGIC:
+            source.close()
+            raise CalculatorException(msg='Not a pace chart')
+        offset = HEADER.size
+        values = struct.unpack_from(f'={columns}d', source, offset)
+        offset += 8 * columns
+        names = bytes(source[offset:offset + names_length]).decode('utf-8').split('\n')
+        offset += names_length + (-(offset + names_length) % 8)
+        table = memoryview(source)[offset:offset + 4 * rows * columns].cast('i')
+        return cls(first_pace, step, list(zip(names, values)), table, source)
+
+    def close(self):
+        """Release the mapped file of a loaded chart."""
+        if self._source is not None:
+            self.table.release()
+            self._source.close()
+            self._source = None
@@ -0,0 +1,98 @@
+"""
+ptlogging.py, gui for the logging
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtWidgets import QHBoxLayout, QPlainTextEdit, QVBoxLayout
+
+from .history import format_record
+from .logstore import LogStore, format_entry
+from .metrics import METRICS
+from .ptwidgets import PTButton, PTTitle
+
+
+class Logging(QVBoxLayout):
+    """GUI logging of any calculations."""
+    def __init__(self, max_entries=1000, history=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.log_store = LogStore(max_entries)
+        self.history = history
+
+        # Initialize the top which contains the title and info.
+        self.top = PTTitle(title='Log',
+                           info='Summary of previous calculations.')
+
+        # Initialize the button widgets for clearing log contents.
+        self.button_clear_all = PTButton('Clear All')
+        self.button_clear_all.setToolTip('Clear all log entries.')
+        self.button_clear_latest = PTButton('Clear Latest')
+        self.button_clear_latest.setToolTip('Clear the most recent log entry.')
+
+        # Horizontal box to hold the buttons.
+        hbox_buttons = QHBoxLayout()
+        hbox_buttons.setAlignment(Qt.AlignCenter)
+        hbox_buttons.addWidget(self.button_clear_all)
+        hbox_buttons.addWidget(self.button_clear_latest)
+
+        # Initialize the log output.
+        self.log_output = QPlainTextEdit()
+        self.log_output.setObjectName('log_output')
+        self.log_output.setFixedSize(450, 175)
+        self.log_output.setReadOnly(True)
+        self.log_output.setUndoRedoEnabled(False)  # entries are edited in place, don't keep an undo history
+
+        # Set the layout.
+        self.setAlignment(Qt.AlignCenter)
+        self.addLayout(self.top)
+        self.addLayout(hbox_buttons)
+        self.addWidget(self.log_output)
+
+        # Reload only the newest page of the history, older records stay on disk.
+        if self.history is not None:
+            for record in reversed(self.history.page(limit=max_entries)):
+                self.log_store.add(format_entry(*format_record(record)))
+            self.log_output.setPlainText('\n'.join(self.log_store))
+
+    @METRICS.timed('render.log')
+    def add_to_log(self, title, first, second, output):
+        """Add an entry to the top of the log based on title."""
+        entry = format_entry(title, first, second, output)
+        if entry is None:
+            return
+        if self.history is not None:
+            self.history.record_entry(title, first, second, output)
+        was_empty = len(self.log_store) == 0
+        dropped_oldest = self.log_store.add(entry)
+
+        # Only the new line, and the dropped line when the log is full, are changed in the widget.
+        document = self.log_output.document()
+        if was_empty:
+            self.log_output.setPlainText(entry)
+            return
+        cursor = QTextCursor(document.firstBlock())
+        cursor.insertText(entry + '\n')
+        if dropped_oldest:
+            cursor = QTextCursor(document.lastBlock())
+            cursor.select(QTextCursor.BlockUnderCursor)  # includes the line break before the block
+            cursor.removeSelectedText()
+
+    def clear_latest(self):
+        """Clear most recent entry from log."""
+        if self.log_store.pop_latest() is None:  # log is already empty
+            return
+        elif len(self.log_store) == 0:
+            self.log_output.clear()
+        else:
+            cursor = QTextCursor(self.log_output.document().firstBlock())
+            cursor.movePosition(QTextCursor.NextBlock, QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+
+    def clear_all(self):
+        """Clear all contents of the log."""
+        self.log_store.clear()
+        self.log_output.clear()
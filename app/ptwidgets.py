@@ -4,16 +4,56 @@ ptwidgets.py, customized widgets for pace & time calculator
 Pace & Time Calculator
 Created by Chad Timmermans (www.github.com/chadtimmermans)
 """
-from PyQt5.QtCore import QRegExp, Qt
+from time import perf_counter
+
+from PyQt5.QtCore import QRegExp, Qt, QTimer
 from PyQt5.QtGui import QRegExpValidator
 from PyQt5.QtWidgets import QLabel, QLineEdit, QPushButton, QVBoxLayout
 
+from .calculatormethods import CalculatorException, convert_to_seconds
+from .expressions import evaluate_seconds
+from .metrics import METRICS
+from .units import FACTORS, parse_distance
+
+# Application wide stylesheet, set once with QApplication.setStyleSheet(). Widgets pick their rules by
+# object name, and state changes (focus, PTOutput state) switch rules instead of setting new stylesheets.
+STYLESHEET = '''
+PaceTimeCalculator { background: white; }
+PTButton { font: bold; color: blue; background: #799ad3; }
+QLabel#title { font: bold 20px; padding: 5px; background: navy; color: white; border: 6px outset black; }
+QLabel#info { font: bold 14px; color: black; }
+QLabel#box_title { font: bold 16px; padding: 3px; color: white; background: navy; border: 4px outset black; }
+QLabel#box_header { font: bold; }
+QListWidget#arithmetic_list { font: bold 13px; }
+QPlainTextEdit#log_output { font: bold 12px; color: white; background: navy; border: 4px outset black; }
+PTField { background: gray; }
+PTField:focus { background: white; }
+PTOutput[state="default"] { color: black; }
+PTOutput[state="valid"] { font: bold; color: blue; }
+PTOutput[state="invalid"] { font: bold; color: red; }
+'''
+
+TIME_PATTERN = QRegExp('^[^\\D][\\d]*:?[\\d]*:?[\\d]+')
+DISTANCE_PATTERN = QRegExp('^[\\d]*[.]?[\\d]*\\s?(km|mi|m|laps?)?')
+OPERAND_PATTERN = QRegExp('^[\\d]*:?[\\d]*:?[\\d]*[.]?[\\d]*')  # a timestamp or a number such as 2.5
+EXPRESSION_PATTERN = QRegExp('^[\\d:.\\s+*/-]*')
+
+# One validator per field type shared by every PTField, created when the first field needs it.
+_validators = {}
+
+
+def shared_validator(pattern):
+    """Return the validator for a regular expression pattern, compiling it only once."""
+    key = pattern.pattern()
+    if key not in _validators:
+        _validators[key] = QRegExpValidator(pattern)
+    return _validators[key]
+
 
 class PTButton(QPushButton):
     """Custom button for PaceTimeCalcualtor."""
     def __init__(self, text='Calculate', *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.setStyleSheet('font: bold; color: blue; background: #799ad3;')
         self.setText(text)
 
 
@@ -24,12 +64,12 @@ class PTTitle(QVBoxLayout):
 
         # Label for the title.
         title = QLabel(title)
-        title.setStyleSheet('font: bold 20px; padding: 5px; background: navy; color: white; border: 6px outset black;')
+        title.setObjectName('title')
         title.setAlignment(Qt.AlignCenter)
 
         # Label for the information header.
         info = QLabel(info)
-        info.setStyleSheet('font: bold 14px; color: black;')
+        info.setObjectName('info')
         info.setAlignment(Qt.AlignCenter)
 
         # Configure the main layout.
@@ -46,19 +86,19 @@ class PTBox(QVBoxLayout):
         # The title widget.
         title = QLabel(title)
         title.setAlignment(Qt.AlignCenter)
-        title.setStyleSheet('font: bold 16px; padding: 3px; color: white; background: navy; border: 4px outset black;')
+        title.setObjectName('box_title')
 
         # Widgets for first input.
         first_header = QLabel(first)
         first_header.setAlignment(Qt.AlignCenter)
-        first_header.setStyleSheet('font: bold;')
+        first_header.setObjectName('box_header')
         self.first_field = PTField(field=first)
         self.first_field.setAlignment(Qt.AlignCenter)
 
         # Widgets for second input.
         second_header = QLabel(second)
         second_header.setAlignment(Qt.AlignCenter)
-        second_header.setStyleSheet('font: bold;')
+        second_header.setObjectName('box_header')
         self.second_field = PTField(field=second)
         self.second_field.setAlignment(Qt.AlignCenter)
 
@@ -81,6 +121,61 @@ class PTBox(QVBoxLayout):
         self.addWidget(self.output)
         self.setAlignment(Qt.AlignCenter)
 
+        # Live updates are off until enable_live_updates() is called.
+        self.live_calculate = None
+        self.live_timer = None
+        self.last_inputs = None
+        self.recomputes = 0
+        self.skipped = 0
+        self.last_latency = 0.0
+
+    def enable_live_updates(self, calculate, delay=250):
+        """Call calculate() once typing in either field pauses for delay milliseconds."""
+        self.live_calculate = calculate
+        self.live_timer = QTimer()
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(delay)
+        self.live_timer.timeout.connect(self.live_update)
+
+        # Every keystroke restarts the timer, so only the last one leads to a calculation.
+        self.first_field.textChanged.connect(lambda _: self.live_timer.start())
+        self.second_field.textChanged.connect(lambda _: self.live_timer.start())
+
+    @METRICS.timed('widget.live_update')
+    def live_update(self):
+        """Recalculate when the parsed inputs have changed since the last calculation."""
+        try:
+            inputs = (self.first_field.parse(), self.second_field.parse())
+        except CalculatorException:  # incomplete input while typing, show the default
+            self.last_inputs = None
+            self.output.reset_widget()
+            return
+        if inputs == self.last_inputs:
+            self.skipped += 1
+            METRICS.increment('widget.live_update.skipped')
+            return
+
+        start = perf_counter()
+        try:
+            self.live_calculate()
+        except CalculatorException as ce:
+            self.output.set_invalid(str(ce))
+        except (ArithmeticError, ValueError):  # e.g. overflow, an exception here would abort the application
+            self.output.set_invalid('INVALID')
+        self.last_latency = perf_counter() - start
+        self.last_inputs = inputs
+        self.recomputes += 1
+        self.output.setToolTip(f'{self.recomputes} recalculations, {self.skipped} skipped, '
+                               f'last took {self.last_latency * 1000:.2f} ms')
+
+
+def parse_pace_distance(text):
+    """Return the distance of text in the unit a pace is given in, miles for mi and kilometers otherwise."""
+    distance = parse_distance(text)
+    if distance.unit in ('km', 'mi'):
+        return distance.value
+    return distance.value * FACTORS[distance.unit, 'km']  # a pace per meter or per lap is not shown
+
 
 class PTField(QLineEdit):
     """Custom QLineEdit for output with either distance or time."""
@@ -88,31 +183,52 @@ class PTField(QLineEdit):
         super().__init__(*args, **kwargs)
 
         regex_pattern = QRegExp()
+        self._parse = convert_to_seconds
+        self._parsed_text = None
+        self._parsed_value = None
 
         # Set the help information and the regular expression pattern based on the input field type.
         if field == 'Time' or field == 'Pace':
             self.setToolTip('Input hour:minute:second, minute:second, or just seconds.')
             self.setPlaceholderText('00:00:00')
-            regex_pattern = QRegExp('^[^\\D][\\d]*:?[\\d]*:?[\\d]+')
+            regex_pattern = TIME_PATTERN
         elif field == 'Distance':
-            self.setToolTip('Decimal usage is optional.')
+            self.setToolTip('Decimal usage is optional. Add km, mi, m or laps to give a unit, '
+                            'a pace is per mile for mi and per km for the others.')
             self.setPlaceholderText('0.0')
-            regex_pattern = QRegExp('^[\\d]*[.]?[\\d]*')
+            regex_pattern = DISTANCE_PATTERN
+            self._parse = parse_pace_distance
+        elif field == 'Operand':
+            self.setToolTip('Input a time, or a number for * and /.')
+            self.setPlaceholderText('00:00:00')
+            regex_pattern = OPERAND_PATTERN
+            self._parse = float
+        elif field == 'Expression':
+            self.setToolTip('Add, subtract, multiply or divide any number of times, e.g. 1:02:03 + 45:10 * 3.')
+            self.setPlaceholderText('1:02:03 + 45:10 * 3 - 12:00 / 2')
+            regex_pattern = EXPRESSION_PATTERN
+            self._parse = evaluate_seconds
 
-        # Use the regular expression pattern on the input field.
-        validator = QRegExpValidator(regex_pattern, self)
-        self.setValidator(validator)
-        self.setStyleSheet('background: gray;')
+        # Use the shared validator for the regular expression pattern on the input field.
+        self.setValidator(shared_validator(regex_pattern))
         self.setAlignment(Qt.AlignCenter)
-        self.setFixedSize(90, 35)
+        self.setFixedSize(280 if field == 'Expression' else 90, 35)
 
-    def focusInEvent(self, event):
-        """Change background when focused."""
-        self.setStyleSheet('background: white;')
+    def parse(self):
+        """Return the value of the field, seconds for a time or pace and a float for a distance.
 
-    def focusOutEvent(self, event):
-        """Change background when out of focus."""
-        self.setStyleSheet('background: gray;')
+        The value is kept until the text changes, so an unchanged field is not parsed again.
+        """
+        text = self.text()
+        if text != self._parsed_text:
+            self._parsed_text = text
+            try:
+                self._parsed_value = self._parse(text)
+            except (CalculatorException, ValueError):
+                self._parsed_value = None
+        if self._parsed_value is None:
+            raise CalculatorException
+        return self._parsed_value
 
 
 class PTOutput(QLabel):
@@ -127,14 +243,23 @@ class PTOutput(QLabel):
 
     def set_valid(self):
         """Change font color when user input is valid."""
-        self.setStyleSheet('font: bold; color: blue;')
+        self.set_state('valid')
 
     def set_invalid(self, error_message):
         """Change font color when user input is invalid."""
-        self.setStyleSheet('font: bold; color: red;')
+        self.set_state('invalid')
         self.setText(error_message)
 
     def reset_widget(self):
         """Reset the widget back to default."""
         self.setText(self.text)
-        self.setStyleSheet('color: black;')
+        self.set_state('default')
+
+    @METRICS.timed('widget.output_state')
+    def set_state(self, state):
+        """Switch the stylesheet rule used for the label, re-polishing only when the state changes."""
+        if self.property('state') != state:
+            METRICS.increment('widget.repolish')
+            self.setProperty('state', state)
+            self.style().unpolish(self)
+            self.style().polish(self)
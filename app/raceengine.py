@@ -0,0 +1,135 @@
+"""
+raceengine.py, pace and projections for whole race result files
+
+Result files are CSV with one split per line: athlete, elapsed time, distance covered,
+for example ``Jane Doe,1:02:03,15``. For every split the engine calculates the pace,
+the projected finish time over the race distance and, when a cutoff time is given, the
+projected distance covered at the cutoff. Files are cut into chunks of lines, the chunks
+are calculated in a pool of worker processes with the batch calculations, and the output
+is written in the same order as the input.
+
+    python -m app.raceengine results.csv --race-distance 42.195 --workers 8 -o paces.csv
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from . import calculatormethods, fixedpoint
+from .calculatormethods import DISTANCE_ROUNDING
+
+HEADER = ['athlete', 'time', 'distance', 'pace', 'projected_finish', 'projected_distance', 'error']
+
+
+def process_chunk(lines, race_distance, cutoff_in_seconds=None):
+    """Calculate one chunk of result lines and return the output as CSV text."""
+    rows = [row + ['', '', ''] for row in csv.reader(lines)]
+    times = calculatormethods.parse_timestamps([row[1].strip() for row in rows])
+    time_errors = set(times.errors)
+
+    # Distances that are not numbers are calculated as 0 and so are marked invalid by the pace batch.
+    distances = []
+    for row in rows:
+        try:
+            distances.append(float(row[2]))
+        except ValueError:
+            distances.append(0.0)
+    paces = calculatormethods.calculate_pace_batch(times.seconds, distances, formatted=True)
+
+    # The projections are exact ratios of the time and distance, time * race_distance / distance,
+    # and are not made from the pace column, which is rounded to whole seconds.
+    scale = fixedpoint.DISTANCE_SCALE
+    race_units = fixedpoint.to_distance_units(race_distance)
+    finishes = []
+    projected = []
+    for time, distance, ok in zip(times.seconds, distances, paces.valid):
+        units = fixedpoint.to_distance_units(distance) if ok else 0
+        finishes.append(time * race_units // units if ok else 0)  # TIME_ROUNDING, down like calculate_time
+        if cutoff_in_seconds is None:
+            projected.append('')
+        elif ok and 0 < time * scale <= cutoff_in_seconds * units:  # Time < Pace like calculate_distance
+            hundredths = fixedpoint.divide(cutoff_in_seconds * units * 100, time * scale, DISTANCE_ROUNDING)
+            projected.append(f'{hundredths / 100:.2f}')
+        else:
+            projected.append('INVALID')
+    finishes = calculatormethods._format_column(finishes, paces.valid)
+
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator='\n')
+    for index, row in enumerate(rows):
+        if index in time_errors or not paces.valid[index]:
+            writer.writerow(row[:3] + ['', '', '', 'INVALID'])
+        else:
+            writer.writerow(row[:3] + [paces.formatted[index], finishes[index], projected[index], ''])
+    return output.getvalue()
+
+
+def read_chunks(paths, chunk_size, skip_header=False):
+    """Yield lists of at most chunk_size lines from each file in order."""
+    for path in paths:
+        with open(path, newline='') as results_file:
+            if skip_header:
+                next(results_file, None)
+            while True:
+                lines = list(islice(results_file, chunk_size))
+                if not lines:
+                    break
+                yield lines
+
+
+def run(paths, output, race_distance, cutoff_in_seconds=None, workers=None, chunk_size=50000, skip_header=False):
+    """Calculate every result file and write the merged output, in input order, to the output stream."""
+    output.write(','.join(HEADER) + '\n')
+    chunks = read_chunks(paths, chunk_size, skip_header)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:  # no pool, calculate in this process
+        for lines in chunks:
+            output.write(process_chunk(lines, race_distance, cutoff_in_seconds))
+        return
+
+    # Keep a bounded number of chunks in flight so memory does not grow with the file size.
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for lines in chunks:
+            pending.append(executor.submit(process_chunk, lines, race_distance, cutoff_in_seconds))
+            if len(pending) >= workers * 2:
+                output.write(pending.popleft().result())
+        while pending:
+            output.write(pending.popleft().result())
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Calculate pace and projections for race result files.')
+    parser.add_argument('paths', nargs='+', help='CSV result files with athlete, time and distance columns')
+    parser.add_argument('--race-distance', type=float, required=True, help='distance used for the projected finish')
+    parser.add_argument('--cutoff', help='timestamp used for the projected distance')
+    parser.add_argument('--workers', type=int, help='worker processes (default: number of cores)')
+    parser.add_argument('--chunk-size', type=int, default=50000, help='lines per chunk (default: 50000)')
+    parser.add_argument('--skip-header', action='store_true', help='the first line of each file is a header')
+    parser.add_argument('-o', '--output', help='output file (default: stdout)')
+    args = parser.parse_args(argv)
+
+    cutoff_in_seconds = None
+    if args.cutoff:
+        cutoff_in_seconds = calculatormethods.convert_to_seconds(args.cutoff)
+
+    if args.output:
+        with open(args.output, 'w', newline='') as output:
+            run(args.paths, output, args.race_distance, cutoff_in_seconds, args.workers, args.chunk_size,
+                args.skip_header)
+    else:
+        run(args.paths, sys.stdout, args.race_distance, cutoff_in_seconds, args.workers, args.chunk_size,
+            args.skip_header)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,311 @@
+r"""
+resultsfile.py, columnar binary results files
+
+A results file holds one row per athlete split in three columns: the overall time as
+int32 seconds, the distance as float32 and the athlete name. Each column is stored in
+one contiguous block after a small header, so a loaded file is mapped with mmap and the
+columns are used in place, e.g. straight into the batch calculations:
+
+    results = ResultsFile.load('results.ptr')
+    paces = calculatormethods.calculate_pace_batch(results.seconds, results.distances)
+
+Layout, all little endian, every block starts on an 8 byte boundary:
+
+    header     magic b'PTRESLT1', rows (uint64), length of the names block (uint64)
+    seconds    int32 * rows
+    distances  float32 * rows
+    offsets    int64 * (rows + 1), where each name starts in the names block
+    names      UTF-8 names back to back
+
+CSV files of athlete, time, distance rows are converted in chunks, so files of any size
+go through in constant memory:
+
+    python -m app.resultsfile import results.csv results.ptr --skip-header
+    python -m app.resultsfile export results.ptr results.csv
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import argparse
+import csv
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from itertools import islice
+
+from . import calculatormethods
+from .calculatormethods import CalculatorException, _check_lengths, _format_column
+
+MAGIC = b'PTRESLT1'
+
+# magic, rows, length of the names block
+HEADER = struct.Struct('<8sQQ')
+
+# The largest time the int32 seconds column holds, about 68 years.
+SECONDS_MAX = 2 ** 31 - 1
+
+LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def _padding(offset):
+    """Return the bytes needed after offset to reach an 8 byte boundary."""
+    return -offset % 8
+
+
+def _layout_size(layout, names_length):
+    """Return the size in bytes of a results file with the (typecode, width, count) columns of layout."""
+    size = HEADER.size
+    for _, width, count in layout:
+        size += width * count
+        size += _padding(size)
+    return size + names_length
+
+
+def _little_endian(column):
+    """Return an array as little endian bytes."""
+    if not LITTLE_ENDIAN:
+        column = array(column.typecode, column)
+        column.byteswap()
+    return memoryview(column).cast('B')
+
+
+class ResultsWriter:
+    """Writes a results file chunk by chunk.
+
+    The seconds go straight into the file and the other columns into temporary files, which
+    are appended once every chunk has been written, so only one chunk is held in memory.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.names_length = 0
+        self._file = open(path, 'wb')
+        self._file.write(b'\0' * HEADER.size)  # written by close() once the row count is known
+        self._distances = tempfile.TemporaryFile()
+        self._offsets = tempfile.TemporaryFile()
+        self._names = tempfile.TemporaryFile()
+
+    def append(self, seconds, distances, names):
+        """Add a chunk of rows, given as a column of seconds, a column of distances and a column of names.
+
+        Seconds must be 0 to SECONDS_MAX. The columns of the chunk are built before anything is written,
+        so a chunk that can not be stored raises and leaves the file as it was.
+        """
+        _check_lengths(seconds, distances)
+        _check_lengths(seconds, names)
+        seconds = array('i', seconds)  # OverflowError beyond an int32
+        distances = array('f', distances)
+        encoded = [name.encode('utf-8') for name in names]
+        offsets = array('q')
+        names_length = self.names_length
+        for name in encoded:
+            offsets.append(names_length)
+            names_length += len(name)
+        self._file.write(_little_endian(seconds))
+        self._distances.write(_little_endian(distances))
+        self._offsets.write(_little_endian(offsets))
+        self._names.write(b''.join(encoded))
+        self.names_length = names_length
+        self.rows += len(encoded)
+
+    def close(self):
+        """Append the remaining columns, write the header and close the file."""
+        output = self._file
+        self._offsets.write(_little_endian(array('q', [self.names_length])))  # the end of the last name
+        for column in (self._distances, self._offsets):
+            output.write(b'\0' * _padding(output.tell()))
+            column.seek(0)
+            shutil.copyfileobj(column, output)
+        output.write(b'\0' * _padding(output.tell()))
+        self._names.seek(0)
+        shutil.copyfileobj(self._names, output)
+        output.seek(0)
+        output.write(HEADER.pack(MAGIC, self.rows, self.names_length))
+        output.close()
+        for column in (self._distances, self._offsets, self._names):
+            column.close()
+
+    def discard(self):
+        """Close and remove the file without finishing it."""
+        for column in (self._file, self._distances, self._offsets, self._names):
+            column.close()
+        os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:  # a half written file would only look like a results file
+            self.discard()
+
+
+class ResultsFile:
+    """The columns of a results file mapped into memory."""
+    def __init__(self, seconds, distances, offsets, names, source=None):
+        self.seconds = seconds  # int32 seconds, a memoryview over the mapped file
+        self.distances = distances  # float32 distances
+        self.offsets = offsets  # int64 start of each name in names, plus the end of the last name
+        self.names = names  # UTF-8 names back to back
+        self._source = source
+
+    @classmethod
+    def load(cls, path):
+        """Map a results file into memory without reading or parsing the columns."""
+        with open(path, 'rb') as results_file:
+            source = mmap.mmap(results_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(source) < HEADER.size or HEADER.unpack_from(source)[0] != MAGIC:
+            source.close()
+            raise CalculatorException(msg='Not a results file')
+        _, rows, names_length = HEADER.unpack_from(source)
+        layout = (('i', 4, rows), ('f', 4, rows), ('q', 8, rows + 1))
+        if len(source) < _layout_size(layout, names_length):  # truncated, or the header is damaged
+            source.close()
+            raise CalculatorException(msg='Not a results file')
+        view = memoryview(source)
+        columns = []
+        offset = HEADER.size
+        for typecode, width, count in layout:
+            column = view[offset:offset + width * count].cast(typecode)
+            if not LITTLE_ENDIAN:  # the file is little endian, so this host works on a copy
+                column = array(typecode, column)
+                column.byteswap()
+            columns.append(column)
+            offset += width * count
+            offset += _padding(offset)
+        names = view[offset:offset + names_length]
+        return cls(*columns, names, source)
+
+    def __len__(self):
+        return len(self.seconds)
+
+    def name(self, index):
+        """Return the name of a row."""
+        return bytes(self.names[self.offsets[index]:self.offsets[index + 1]]).decode('utf-8')
+
+    def row(self, index):
+        """Return the (name, seconds, distance) of a row."""
+        return self.name(index), self.seconds[index], self.distances[index]
+
+    def close(self):
+        """Release the mapped file."""
+        if self._source is not None:
+            for column in (self.seconds, self.distances, self.offsets, self.names):
+                if isinstance(column, memoryview):
+                    column.release()
+            self._source.close()
+            self._source = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def parse_rows(lines):
+    """Return the names, seconds and distances of CSV lines of athlete, time, distance, and the rows skipped.
+
+    Times are parsed as one column with parse_timestamps. Rows that can not be read, or with a time
+    beyond SECONDS_MAX, are skipped.
+    """
+    names, times, distances, skipped = [], [], [], 0
+    for row in csv.reader(lines):
+        try:
+            name, time, distance = row[:3]
+            distance = float(distance)
+        except ValueError:
+            skipped += 1
+            continue
+        names.append(name)
+        times.append(time.strip())
+        distances.append(distance)
+
+    parsed = calculatormethods.parse_timestamps(times)
+    seconds = parsed.seconds
+    errors = set(parsed.errors)
+    if seconds and max(seconds) > SECONDS_MAX:
+        errors.update(index for index, value in enumerate(seconds) if value > SECONDS_MAX)
+    if errors:
+        keep = [index for index in range(len(names)) if index not in errors]
+        names = [names[index] for index in keep]
+        seconds = [seconds[index] for index in keep]
+        distances = [distances[index] for index in keep]
+        skipped += len(errors)
+    return names, seconds, distances, skipped
+
+
+def import_csv(csv_file, path, chunk_size=65536, skip_header=False):
+    """Convert a CSV stream of athlete, time, distance rows into a results file, chunk_size lines at a time.
+
+    Returns the number of rows written and the number of rows skipped.
+    """
+    skipped = 0
+    if skip_header:
+        next(csv_file, None)
+    with ResultsWriter(path) as writer:
+        while True:
+            lines = list(islice(csv_file, chunk_size))
+            if not lines:
+                break
+            names, seconds, distances, chunk_skipped = parse_rows(lines)
+            writer.append(seconds, distances, names)
+            skipped += chunk_skipped
+        return writer.rows, skipped
+
+
+def export_csv(path, csv_file, chunk_size=65536):
+    """Write a results file as CSV athlete, time, distance rows, chunk_size rows at a time."""
+    writer = csv.writer(csv_file, lineterminator='\n')
+    with ResultsFile.load(path) as results:
+        rows = len(results)
+        for start in range(0, rows, chunk_size):
+            stop = min(start + chunk_size, rows)
+            base = results.offsets[start]
+            names = bytes(results.names[base:results.offsets[stop]])
+            with results.seconds[start:stop] as seconds, results.distances[start:stop] as distances:
+                timestamps = _format_column(seconds, array('b', [1]) * len(seconds))
+                writer.writerows(
+                    (names[results.offsets[index] - base:results.offsets[index + 1] - base].decode('utf-8'),
+                     timestamp, f'{distance:.7g}')
+                    for index, timestamp, distance in zip(range(start, stop), timestamps, distances))
+        return rows
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Convert race results between CSV and the columnar binary format.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+    importer = commands.add_parser('import', help='CSV of athlete, time, distance rows to a results file')
+    importer.add_argument('csv', help='CSV file, - for stdin')
+    importer.add_argument('results', help='results file to write')
+    importer.add_argument('--skip-header', action='store_true', help='the first line is a header')
+    importer.add_argument('--chunk-size', type=int, default=65536, help='lines per chunk (default: 65536)')
+    exporter = commands.add_parser('export', help='results file to CSV')
+    exporter.add_argument('results', help='results file to read')
+    exporter.add_argument('csv', help='CSV file to write, - for stdout')
+    exporter.add_argument('--chunk-size', type=int, default=65536, help='rows per chunk (default: 65536)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'import':
+        if args.csv == '-':
+            rows, skipped = import_csv(sys.stdin, args.results, args.chunk_size, args.skip_header)
+        else:
+            with open(args.csv, newline='') as csv_file:
+                rows, skipped = import_csv(csv_file, args.results, args.chunk_size, args.skip_header)
+        print(f'{rows} rows written, {skipped} skipped', file=sys.stderr)
+    elif args.csv == '-':
+        export_csv(args.results, sys.stdout, args.chunk_size)
+    else:
+        with open(args.csv, 'w', newline='') as csv_file:
+            export_csv(args.results, csv_file, args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
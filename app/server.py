@@ -0,0 +1,276 @@
+"""
+server.py, local HTTP/JSON calculation service
+
+Runs on the standard library only (asyncio). Each endpoint takes a JSON object and
+returns {"result": ...} or, for an invalid calculation, {"error": ...}:
+
+    POST /pace      {"time": "1:00:00", "distance": 10}
+    POST /time      {"pace": "5:00", "distance": 42.195}
+    POST /distance  {"time": "1:00:00", "pace": "5:00"}
+    POST /add       {"left": "45:10", "right": "12:00"}
+    POST /subtract  {"left": "45:10", "right": "12:00"}
+    GET  /stats     request count, throughput and p50/p99 latency
+
+Requests that arrive at the same time are collected for a short window and calculated
+together with the batch calculations.
+
+    python -m app.server --port 8080
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import deque
+
+from . import calculatormethods
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 422: 'Unprocessable Entity'}
+
+
+def _parse_distances(values):
+    """Convert a column of distances to floats, invalid or non-finite values become 0 and are listed by row."""
+    distances = []
+    errors = set()
+    for index, value in enumerate(values):
+        try:
+            distance = float(value)
+        except (TypeError, ValueError, OverflowError):  # OverflowError for JSON integers beyond a float
+            distance = math.nan
+        if math.isfinite(distance):
+            distances.append(distance)
+        else:
+            distances.append(0.0)
+            errors.add(index)
+    return distances, errors
+
+
+def _results(batch, errors, message):
+    """Pair each row of a batch with its result or its error message."""
+    results = []
+    for index, (output, ok) in enumerate(zip(batch.formatted, batch.valid)):
+        if index in errors:  # the input could not be parsed
+            results.append((None, 'INVALID'))
+        elif not ok:
+            results.append((None, message))
+        else:
+            results.append((output, None))
+    return results
+
+
+def pace_kernel(times, distances):
+    """Calculate a batch of paces from timestamps and distances."""
+    parsed = calculatormethods.parse_timestamps([str(time).strip() for time in times])
+    distances, errors = _parse_distances(distances)
+    batch = calculatormethods.calculate_pace_batch(parsed.seconds, distances, formatted=True)
+    return _results(batch, errors.union(parsed.errors), 'INVALID')
+
+
+def time_kernel(paces, distances):
+    """Calculate a batch of overall times from pace timestamps and distances."""
+    parsed = calculatormethods.parse_timestamps([str(pace).strip() for pace in paces])
+    distances, errors = _parse_distances(distances)
+    batch = calculatormethods.calculate_time_batch(parsed.seconds, distances, formatted=True)
+    return _results(batch, errors.union(parsed.errors), 'INVALID')
+
+
+def distance_kernel(times, paces):
+    """Calculate a batch of distances from overall time and pace timestamps."""
+    times = calculatormethods.parse_timestamps([str(time).strip() for time in times])
+    paces = calculatormethods.parse_timestamps([str(pace).strip() for pace in paces])
+    batch = calculatormethods.calculate_distance_batch(times.seconds, paces.seconds, formatted=True)
+    return _results(batch, set(times.errors).union(paces.errors), 'Time < Pace')
+
+
+def add_kernel(lefts, rights):
+    """Add a batch of timestamps."""
+    lefts = calculatormethods.parse_timestamps([str(left).strip() for left in lefts])
+    rights = calculatormethods.parse_timestamps([str(right).strip() for right in rights])
+    batch = calculatormethods.add_time_batch(lefts.seconds, rights.seconds, formatted=True)
+    return _results(batch, set(lefts.errors).union(rights.errors), 'INVALID')
+
+
+def subtract_kernel(lefts, rights):
+    """Subtract a batch of timestamps."""
+    lefts = calculatormethods.parse_timestamps([str(left).strip() for left in lefts])
+    rights = calculatormethods.parse_timestamps([str(right).strip() for right in rights])
+    batch = calculatormethods.subtract_time_batch(lefts.seconds, rights.seconds, formatted=True)
+    return _results(batch, set(lefts.errors).union(rights.errors), 'Left < Right')
+
+
+# Path: (kernel, name of the first field, name of the second field)
+ROUTES = {
+    '/pace': (pace_kernel, 'time', 'distance'),
+    '/time': (time_kernel, 'pace', 'distance'),
+    '/distance': (distance_kernel, 'time', 'pace'),
+    '/add': (add_kernel, 'left', 'right'),
+    '/subtract': (subtract_kernel, 'left', 'right'),
+}
+
+
+class Batcher:
+    """Collects calculations for a short window and runs them through a kernel together."""
+    def __init__(self, kernel, window, max_batch):
+        self.kernel = kernel
+        self.window = window
+        self.max_batch = max_batch
+        self.pending = []
+        self.timer = None
+        self.batches = 0
+
+    def submit(self, first, second):
+        """Queue a calculation and return a future for its (result, error)."""
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self.pending.append((first, second, future))
+        if len(self.pending) >= self.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self):
+        """Calculate everything queued so far."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        pending, self.pending = self.pending, []
+        if not pending:
+            return
+        self.batches += 1
+        try:
+            results = self.kernel([first for first, _, _ in pending], [second for _, second, _ in pending])
+        except Exception:  # every future must be resolved, so one bad request does not fail the others
+            results = [self.calculate_one(first, second) for first, second, _ in pending]
+        for (_, _, future), result in zip(pending, results):
+            if not future.done():  # the client may have gone away
+                future.set_result(result)
+
+    def calculate_one(self, first, second):
+        """Run the kernel on a single calculation, its (result, error) is INVALID when the kernel fails."""
+        try:
+            return self.kernel([first], [second])[0]
+        except Exception:
+            return None, 'INVALID'
+
+
+class CalculationServer:
+    """HTTP/JSON front end for the batch calculations."""
+    def __init__(self, window=0.002, max_batch=1024, latency_samples=100000):
+        self.routes = {path: (Batcher(kernel, window, max_batch), first, second)
+                       for path, (kernel, first, second) in ROUTES.items()}
+        self.latencies = deque(maxlen=latency_samples)
+        self.requests = 0
+        self.started = time.perf_counter()
+
+    async def start(self, host='127.0.0.1', port=8080):
+        """Start listening and return the asyncio server."""
+        self.started = time.perf_counter()
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def handle(self, reader, writer):
+        """Serve the requests of one connection, keeping it open between requests."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                start = time.perf_counter()
+                try:
+                    request_line, *header_lines = head.decode('latin-1').rstrip('\r\n').split('\r\n')
+                    method, path, version = request_line.split(' ', 2)
+                    headers = dict((name.strip().lower(), value.strip())
+                                   for name, value in (line.split(':', 1) for line in header_lines))
+                    body = await reader.readexactly(int(headers.get('content-length', 0)))
+                except (ValueError, asyncio.IncompleteReadError):
+                    await self.respond(writer, 400, {'error': 'Bad Request'}, keep_alive=False)
+                    break
+                status, payload = await self.dispatch(method, path, body)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                await self.respond(writer, status, payload, keep_alive)
+                self.requests += 1
+                self.latencies.append(time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body):
+        """Return the status and JSON payload for a request."""
+        if path == '/stats':
+            return 200, self.stats()
+        if path not in self.routes:
+            return 404, {'error': 'Not Found'}
+        if method != 'POST':
+            return 405, {'error': 'Method Not Allowed'}
+        batcher, first, second = self.routes[path]
+        try:
+            request = json.loads(body.decode('utf-8'))
+            first, second = request[first], request[second]
+        except (ValueError, KeyError, TypeError):
+            return 400, {'error': f'Expected a JSON object with "{first}" and "{second}"'}
+        result, error = await batcher.submit(first, second)
+        if error is not None:
+            return 422, {'error': error}
+        return 200, {'result': result}
+
+    @staticmethod
+    async def respond(writer, status, payload, keep_alive=True):
+        """Write a JSON response."""
+        data = json.dumps(payload).encode('utf-8')
+        connection = 'keep-alive' if keep_alive else 'close'
+        writer.write(f'HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n'
+                     f'Content-Length: {len(data)}\r\nConnection: {connection}\r\n\r\n'.encode('latin-1') + data)
+        await writer.drain()
+
+    def stats(self):
+        """Return the request count, throughput, p50/p99 latency (ms) and batches per endpoint."""
+        latencies = sorted(self.latencies)
+        elapsed = time.perf_counter() - self.started
+        return {
+            'requests': self.requests,
+            'throughput': self.requests / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+            'batches': {path[1:]: batcher.batches for path, (batcher, _, _) in self.routes.items()},
+        }
+
+
+def percentile(ordered, fraction):
+    """Return the value at fraction (0 to 1) of an ordered list, 0 when it is empty."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Serve the calculators over HTTP/JSON.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='port to listen on (default: 8080)')
+    parser.add_argument('--window-ms', type=float, default=2.0,
+                        help='how long requests are collected into one batch (default: 2)')
+    parser.add_argument('--max-batch', type=int, default=1024, help='largest batch (default: 1024)')
+    args = parser.parse_args(argv)
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    server = loop.run_until_complete(CalculationServer(args.window_ms / 1000, args.max_batch)
+                                     .start(args.host, args.port))
+    print(f'Serving on http://{args.host}:{args.port}')
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+
+
+if __name__ == '__main__':
+    main()
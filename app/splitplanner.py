@@ -0,0 +1,111 @@
+"""
+splitplanner.py, race plans with a target pace per segment
+
+A plan is a list of segments, each with a distance, a target pace (seconds per unit of
+distance) and an adjustment factor for elevation or fade (1.0 = no adjustment). Segment
+times are kept in whole milliseconds in a Fenwick tree, so changing one segment and reading
+any cumulative split both take O(log n), and all splits come out of one prefix-sum pass.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import math
+from itertools import accumulate
+
+from . import calculatormethods
+from .calculatormethods import CalculatorException
+
+
+class SplitPlan:
+    """Per segment target paces with cumulative split times."""
+    def __init__(self, distances, paces, factors=None):
+        if factors is None:
+            factors = [1.0] * len(distances)
+        if not len(distances) == len(paces) == len(factors):
+            raise CalculatorException(msg='Length mismatch')
+        self.distances = [float(distance) for distance in distances]
+        self.paces = [float(pace) for pace in paces]
+        self.factors = [float(factor) for factor in factors]
+        self.times = [self._segment_time(index) for index in range(len(self.distances))]
+        self._tree = self._build_tree(self.times)
+
+    @classmethod
+    def even(cls, total_distance, pace, segment=1.0, fade=0.0):
+        """Plan a race in segments of equal distance, the last one holding the remainder.
+
+        fade changes the pace linearly from the first to the last segment while keeping the
+        average factor at 1, e.g. fade=0.04 slows from 2% faster to 2% slower than the target
+        and fade=-0.04 plans a negative split.
+        """
+        count = max(1, math.ceil(total_distance / segment - 1e-9))
+        distances = [segment] * (count - 1) + [total_distance - segment * (count - 1)]
+        if count == 1:
+            factors = [1.0]
+        else:
+            factors = [1.0 + fade * (index / (count - 1) - 0.5) for index in range(count)]
+        return cls(distances, [pace] * count, factors)
+
+    def __len__(self):
+        return len(self.times)
+
+    def _segment_time(self, index):
+        """Return the adjusted time of one segment in whole milliseconds."""
+        return int(round(self.distances[index] * self.paces[index] * self.factors[index] * 1000))
+
+    @staticmethod
+    def _build_tree(values):
+        """Build a Fenwick tree over the values in O(n)."""
+        tree = [0] + list(values)
+        for index in range(1, len(tree)):
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        return tree
+
+    def _update(self, index):
+        """Recalculate one segment and update the tree with the change."""
+        time = self._segment_time(index)
+        delta = time - self.times[index]
+        self.times[index] = time
+        position = index + 1
+        while position < len(self._tree):
+            self._tree[position] += delta
+            position += position & -position
+
+    def set_pace(self, index, pace):
+        """Change the target pace of one segment."""
+        self.paces[index] = float(pace)
+        self._update(index)
+
+    def set_factor(self, index, factor):
+        """Change the elevation or fade factor of one segment."""
+        self.factors[index] = float(factor)
+        self._update(index)
+
+    def set_distance(self, index, distance):
+        """Change the distance of one segment."""
+        self.distances[index] = float(distance)
+        self._update(index)
+
+    def elapsed(self, index):
+        """Return the cumulative time in milliseconds at the end of segment index."""
+        if not 0 <= index < len(self.times):
+            raise CalculatorException(msg='Segment not in plan')
+        total = 0
+        position = index + 1
+        while position > 0:
+            total += self._tree[position]
+            position -= position & -position
+        return total
+
+    def total_time(self):
+        """Return the planned finish time in milliseconds."""
+        return self.elapsed(len(self.times) - 1) if self.times else 0
+
+    def splits(self):
+        """Return the cumulative time in milliseconds at the end of every segment."""
+        return list(accumulate(self.times))
+
+    def timestamps(self):
+        """Return every cumulative split as a timestamp, rounded to whole seconds."""
+        return [calculatormethods.convert_to_timestamp(int(round(split / 1000))) for split in self.splits()]
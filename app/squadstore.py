@@ -0,0 +1,90 @@
+"""
+squadstore.py, columnar storage for a squad of athletes
+
+Each column is a compact array: overall time and pace in seconds, and distance.
+Loading a squad calculates every pace in one batch pass, and editing a value
+recalculates only that athlete's row.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+from array import array
+
+from . import calculatormethods
+from .calculatormethods import CalculatorException
+
+
+class SquadStore:
+    """Athletes with their overall time, pace and distance kept in parallel columns."""
+    def __init__(self):
+        self.names = []
+        self.times = array('q')
+        self.paces = array('q')
+        self.distances = array('d')
+        self.valid = array('b')
+
+    def __len__(self):
+        return len(self.names)
+
+    def extend(self, names, times_in_seconds, distances):
+        """Add athletes and calculate all of their paces at once.
+
+        Every value is checked before any column changes, so a time that does not fit into the
+        times column raises CalculatorException and leaves the store as it was.
+        """
+        times, distances = _column('q', times_in_seconds), _column('d', distances)
+        calculatormethods._check_lengths(names, times)
+        paces = calculatormethods.calculate_pace_batch(times, distances)
+        self.names.extend(names)
+        self.times.extend(times)
+        self.distances.extend(distances)
+        self.paces.extend(paces.values)
+        self.valid.extend(paces.valid)
+
+    def extend_store(self, other):
+        """Add the athletes of another store, their paces are already calculated."""
+        self.names.extend(other.names)
+        self.times.extend(other.times)
+        self.distances.extend(other.distances)
+        self.paces.extend(other.paces)
+        self.valid.extend(other.valid)
+
+    def append(self, name, time_in_seconds=0, distance=0.0):
+        """Add one athlete."""
+        self.extend([name], [time_in_seconds], [distance])
+
+    def set_name(self, row, name):
+        """Rename an athlete."""
+        self.names[row] = name
+
+    def set_time(self, row, time_in_seconds):
+        """Change an athlete's overall time and recalculate the pace."""
+        self.times[row] = _column('q', [time_in_seconds])[0]
+        self._update_pace(row)
+
+    def set_distance(self, row, distance):
+        """Change an athlete's distance and recalculate the pace."""
+        self.distances[row] = distance
+        self._update_pace(row)
+
+    def set_pace(self, row, pace_in_seconds):
+        """Change an athlete's pace and recalculate the overall time, exactly like calculate_time."""
+        pace_in_seconds = _column('q', [pace_in_seconds])[0]
+        times = calculatormethods.calculate_time_batch([pace_in_seconds], [self.distances[row]])
+        self.paces[row] = pace_in_seconds
+        self.times[row] = times.values[0]
+        self.valid[row] = 1 if times.valid[0] and self.distances[row] > 0 else 0
+
+    def _update_pace(self, row):
+        """Recalculate the pace of one row, exactly like calculate_pace."""
+        paces = calculatormethods.calculate_pace_batch([self.times[row]], [self.distances[row]])
+        self.paces[row] = paces.values[0]
+        self.valid[row] = paces.valid[0]
+
+
+def _column(typecode, values):
+    """Return values as a typed column, raising CalculatorException for values that do not fit into it."""
+    try:
+        return array(typecode, values)
+    except (OverflowError, TypeError):
+        raise CalculatorException
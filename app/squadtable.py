@@ -0,0 +1,250 @@
+"""
+squadtable.py, gui for working through a whole squad of athletes
+
+Rows are drawn by a QTableView from a QAbstractTableModel over a SquadStore, so only
+the visible cells are ever formatted and thousands of rows scroll smoothly.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import csv
+import os
+from itertools import islice
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtWidgets import (QFileDialog, QHBoxLayout, QHeaderView, QLabel, QProgressBar, QTableView,
+                             QVBoxLayout, QWidget)
+
+from . import calculatormethods
+from .calculatormethods import CalculatorException
+from .ptwidgets import PTButton, PTTitle
+from .squadstore import SquadStore
+from .workers import WorkerPool
+
+NAME, TIME, PACE, DISTANCE = range(4)
+HEADERS = ('Athlete', 'Time', 'Pace', 'Distance')
+
+
+def parse_rows(rows):
+    """Return the names, times in seconds and distances of (name, time, distance) rows.
+
+    Rows that can not be read, or with a time that does not fit into the times column, are skipped.
+    """
+    names, times, distances = [], [], []
+    for row in rows:
+        try:
+            name, time, distance = row[:3]
+            time_in_seconds = calculatormethods.convert_to_seconds(time.strip())
+            distance = float(distance)
+        except (CalculatorException, ValueError):
+            continue
+        if time_in_seconds > calculatormethods.INT64_MAX:
+            continue
+        names.append(name)
+        times.append(time_in_seconds)
+        distances.append(distance)
+    return names, times, distances
+
+
+def read_athletes(path, chunk_size=10000):
+    """Read the athletes of a CSV file, chunk_size rows at a time.
+
+    A generator for a Worker: yields (bytes read, file size) after every chunk and
+    returns the names, times in seconds and distances.
+    """
+    names, times, distances = [], [], []
+    try:
+        size = os.path.getsize(path)
+        with open(path, 'rb') as squad_file:
+            rows = csv.reader(line.decode('utf-8', 'replace') for line in squad_file)
+            chunk = list(islice(rows, chunk_size))
+            while chunk:
+                chunk_names, chunk_times, chunk_distances = parse_rows(chunk)
+                names.extend(chunk_names)
+                times.extend(chunk_times)
+                distances.extend(chunk_distances)
+                yield squad_file.tell(), size
+                chunk = list(islice(rows, chunk_size))
+    except (OSError, csv.Error) as error:
+        raise CalculatorException(f'Could not read {os.path.basename(path)}') from error
+    return names, times, distances
+
+
+class SquadTableModel(QAbstractTableModel):
+    """Table model with one athlete per row: name, time, pace and distance."""
+    def __init__(self, store=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.store = store if store is not None else SquadStore()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Format a cell only when the view asks for it."""
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.TextAlignmentRole and column != NAME:
+            return Qt.AlignCenter
+        if role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        if column == NAME:
+            return self.store.names[row]
+        elif column == TIME:
+            return calculatormethods.convert_to_timestamp(self.store.times[row])
+        elif column == PACE:
+            if not self.store.valid[row]:
+                return 'INVALID'
+            return calculatormethods.convert_to_timestamp(self.store.paces[row])
+        return f'{self.store.distances[row]:.2f}'
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """Store an edited cell and recalculate only its row."""
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        row, column = index.row(), index.column()
+        try:
+            if column == NAME:
+                self.store.set_name(row, str(value))
+            elif column == TIME:
+                self.store.set_time(row, calculatormethods.convert_to_seconds(str(value)))
+            elif column == PACE:
+                self.store.set_pace(row, calculatormethods.convert_to_seconds(str(value)))
+            else:
+                self.store.set_distance(row, float(value))
+        except (CalculatorException, ValueError):
+            return False
+        self.dataChanged.emit(self.index(row, NAME), self.index(row, DISTANCE))
+        return True
+
+    def add_athletes(self, names, times_in_seconds, distances):
+        """Append athletes to the end of the table, raises CalculatorException before any row is added."""
+        if not names:
+            return
+        athletes = SquadStore()
+        athletes.extend(names, times_in_seconds, distances)
+        first = len(self.store)
+        self.beginInsertRows(QModelIndex(), first, first + len(athletes) - 1)
+        self.store.extend_store(athletes)
+        self.endInsertRows()
+
+
+class SquadTable(QWidget):
+    """Window with the squad table and buttons to add or import athletes."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setWindowTitle('Squad Table')
+
+        # Initialize the model and the view, fixed row heights keep scrolling cheap for large squads.
+        self.model = SquadTableModel()
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.view.verticalHeader().setDefaultSectionSize(24)
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
+        # Initialize the buttons.
+        self.add_button = PTButton('Add Athlete')
+        self.add_button.clicked.connect(self.add_athlete)
+        self.import_button = PTButton('Import CSV')
+        self.import_button.setToolTip('Import a CSV file with athlete, time and distance columns.')
+        self.import_button.clicked.connect(self.import_csv)
+        self.cancel_button = PTButton('Cancel')
+        self.cancel_button.clicked.connect(self.cancel_import)
+
+        # Progress of an import, shown only while a file is read in the background.
+        self.workers = WorkerPool()
+        self.import_worker = None
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 1000)
+        self.progress.hide()
+        self.cancel_button.hide()
+        self.error_label = QLabel()
+        self.error_label.setObjectName('error_label')
+        self.error_label.hide()
+
+        # Horizontal box to hold the buttons.
+        hbox_buttons = QHBoxLayout()
+        hbox_buttons.setAlignment(Qt.AlignCenter)
+        hbox_buttons.addWidget(self.add_button)
+        hbox_buttons.addWidget(self.import_button)
+        hbox_buttons.addWidget(self.progress)
+        hbox_buttons.addWidget(self.cancel_button)
+        hbox_buttons.addWidget(self.error_label)
+
+        # Set the layout.
+        layout = QVBoxLayout()
+        layout.addLayout(PTTitle(title='Squad Table', info='Edit a time, pace or distance to recalculate the row.'))
+        layout.addLayout(hbox_buttons)
+        layout.addWidget(self.view)
+        self.setLayout(layout)
+        self.resize(500, 600)
+
+    def add_athlete(self):
+        """Add an empty row for a new athlete."""
+        self.model.add_athletes([f'Athlete {len(self.model.store) + 1}'], [0], [0.0])
+        self.view.scrollToBottom()
+
+    def import_csv(self):
+        """Add every athlete of a CSV file, read in the background, rows that can not be read are skipped."""
+        path, _ = QFileDialog.getOpenFileName(self, 'Import Athletes', '', 'CSV files (*.csv);;All files (*)')
+        if path:
+            self.import_path(path)
+
+    def import_path(self, path):
+        """Read a CSV file of athletes on the worker pool and add them once it has been read."""
+        self.cancel_import()
+        self.import_button.setEnabled(False)
+        self.error_label.hide()
+        self.progress.setValue(0)
+        self.progress.show()
+        self.cancel_button.show()
+        # The finished signal is queued, so worker is set before it arrives.
+        worker = self.workers.start(read_athletes, path,
+                                    on_result=lambda columns: self.model.add_athletes(*columns),
+                                    on_error=self.show_error,
+                                    on_progress=self.show_progress,
+                                    on_finished=lambda: self.import_worker is worker and self.import_finished())
+        self.import_worker = worker
+
+    def show_progress(self, done, total):
+        """Show how much of the file has been read."""
+        self.progress.setValue(done * 1000 // total if total else 1000)
+
+    def show_error(self, ce):
+        """Show why the file could not be imported."""
+        self.error_label.setText(str(ce))
+        self.error_label.show()
+
+    def cancel_import(self):
+        """Stop reading the file, no athletes of it are added."""
+        if self.import_worker is not None:
+            self.import_worker.cancel()
+            self.import_finished()
+
+    def import_finished(self):
+        """Hide the progress once the import is done or cancelled."""
+        self.import_worker = None
+        self.progress.hide()
+        self.cancel_button.hide()
+        self.import_button.setEnabled(True)
+
+    def closeEvent(self, event):
+        """Cancel an import that is still running."""
+        self.cancel_import()
+        super().closeEvent(event)
+
+    def load_rows(self, rows):
+        """Add athletes from (name, time, distance) rows."""
+        self.model.add_athletes(*parse_rows(rows))
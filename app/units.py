@@ -0,0 +1,132 @@
+"""
+units.py, unit-aware distances and paces
+
+Distances can be in kilometers (km), miles (mi), meters (m) or laps of a 400m track (lap).
+Conversion factors between every pair of units are calculated once, and the batch
+calculations below convert while they calculate, so one pass gives results in every unit.
+They work on whole millimeters and fixedpoint distance units, so they round exactly like
+the calculations in calculatormethods.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import re
+from array import array
+from collections import namedtuple
+
+from . import fixedpoint
+from .calculatormethods import (DISTANCE_ROUNDING, EXACT_SECONDS, LIMIT, PACE_ROUNDING, TIME_ROUNDING, BatchResult,
+                                CalculatorException, _check_lengths, _distance_units, _ratio)
+
+# Millimeters in one unit, whole numbers so the batch calculations convert exactly.
+MILLIMETERS = {'km': 1000000, 'mi': 1609344, 'm': 1000, 'lap': 400000}
+
+# Meters in one unit.
+UNITS = {unit: millimeters / 1000 for unit, millimeters in MILLIMETERS.items()}
+
+# FACTORS[from_unit, to_unit] converts a distance, e.g. 5 km * FACTORS['km', 'm'] = 5000 m.
+# A pace per from_unit converts the other way, pace * FACTORS[to_unit, from_unit].
+FACTORS = {(source, target): UNITS[source] / UNITS[target] for source in UNITS for target in UNITS}
+
+DISTANCE_PATTERN = re.compile(r'^\s*(\d+\.?\d*|\.\d+)\s*(km|mi|m|laps?)?\s*$')
+
+
+class Distance(namedtuple('Distance', ['value', 'unit'])):
+    """A distance and its unit."""
+    __slots__ = ()
+
+    def to(self, unit):
+        """Return the distance in another unit."""
+        return Distance(self.value * FACTORS[self.unit, unit], unit)
+
+    def __str__(self):
+        return f'{self.value:g}{self.unit}'
+
+
+class Pace(namedtuple('Pace', ['seconds', 'unit'])):
+    """A pace in seconds per unit of distance."""
+    __slots__ = ()
+
+    def to(self, unit):
+        """Return the pace per another unit."""
+        return Pace(self.seconds * FACTORS[unit, self.unit], unit)
+
+
+def parse_distance(text, default='km'):
+    """Convert text such as '5', '5km', '3.1 mi' or '12 laps' into a Distance."""
+    match = DISTANCE_PATTERN.match(text)
+    if match is None:
+        raise CalculatorException
+    unit = match.group(2) or default
+    return Distance(float(match.group(1)), 'lap' if unit == 'laps' else unit)
+
+
+def calculate_pace_units(times_in_seconds, distances, unit='km', out_units=tuple(UNITS)):
+    """Calculate pace times per every unit in out_units from overall times and distances in unit.
+
+    Returns a dict of unit to BatchResult, rounded exactly like calculate_pace. Rows with a distance
+    of zero or less, or an overall time of EXACT_SECONDS or more, are marked invalid.
+    """
+    _check_lengths(times_in_seconds, distances)
+    scale = fixedpoint.DISTANCE_SCALE
+    columns = [array('q') for _ in out_units]
+    valid = array('b')
+    for time, units in zip(times_in_seconds, _distance_units(distances)):
+        if units > 0 and -EXACT_SECONDS < time < EXACT_SECONDS:
+            valid.append(1)
+            numerator, denominator = _ratio(time)
+            for column, out_unit in zip(columns, out_units):
+                column.append(fixedpoint.divide(numerator * scale * MILLIMETERS[out_unit],
+                                                denominator * units * MILLIMETERS[unit], PACE_ROUNDING))
+        else:
+            valid.append(0)
+            for column in columns:
+                column.append(0)
+    return {out_unit: BatchResult(column, valid, None) for out_unit, column in zip(out_units, columns)}
+
+
+def calculate_time_units(paces_in_seconds, pace_unit, distances, distance_unit):
+    """Calculate overall times from paces per pace_unit and distances in distance_unit.
+
+    Truncated to whole seconds like calculate_time. Rows with a negative pace or distance, or a time
+    that does not fit into the values column, are marked invalid.
+    """
+    _check_lengths(paces_in_seconds, distances)
+    denominator = fixedpoint.DISTANCE_SCALE * MILLIMETERS[pace_unit]
+    times = array('q')
+    valid = array('b')
+    for pace, units in zip(paces_in_seconds, _distance_units(distances)):
+        time = -1
+        if 0 <= pace < LIMIT and units >= 0:
+            numerator, pace_denominator = _ratio(pace)
+            time = fixedpoint.divide(numerator * units * MILLIMETERS[distance_unit], pace_denominator * denominator,
+                                     TIME_ROUNDING)
+        ok = 0 <= time < LIMIT
+        valid.append(ok)
+        times.append(time if ok else 0)
+    return BatchResult(times, valid, None)
+
+
+def calculate_distance_units(times_in_seconds, paces_in_seconds, pace_unit='km', out_units=tuple(UNITS)):
+    """Calculate distances in every unit in out_units from overall times and paces per pace_unit.
+
+    Returns a dict of unit to BatchResult, rounded exactly like calculate_distance. Rows where
+    Time < Pace, the pace is 0 or less, or the time or the distance is EXACT_SECONDS or more, are
+    marked invalid.
+    """
+    _check_lengths(times_in_seconds, paces_in_seconds)
+    columns = [array('d') for _ in out_units]
+    valid = array('b')
+    for time, pace in zip(times_in_seconds, paces_in_seconds):
+        if 0 < pace <= time < EXACT_SECONDS and time / pace < EXACT_SECONDS:
+            valid.append(1)
+            (time, time_denominator), (pace, pace_denominator) = _ratio(time), _ratio(pace)
+            for column, out_unit in zip(columns, out_units):
+                column.append(fixedpoint.divide(time * pace_denominator * 100 * MILLIMETERS[pace_unit],
+                                                time_denominator * pace * MILLIMETERS[out_unit],
+                                                DISTANCE_ROUNDING) / 100)
+        else:
+            valid.append(0)
+            for column in columns:
+                column.append(0.0)
+    return {out_unit: BatchResult(column, valid, None) for out_unit, column in zip(out_units, columns)}
@@ -0,0 +1,131 @@
+"""
+workers.py, runs calculations on a QThreadPool so the GUI stays responsive
+
+A Worker calls a function on a pool thread and hands the outcome back to the GUI thread
+through Qt signals: result with the return value, error with the CalculatorException, and
+finished once it is done either way. Functions that take a while can be generators, they
+yield (done, total) progress every so often and return their result at the end, which
+also lets a cancelled worker stop between two steps:
+
+    def read_rows(path):
+        ...
+        yield rows_read, total_rows
+        ...
+        return rows
+
+    pool = WorkerPool()
+    worker = pool.start(read_rows, path, on_result=show_rows, on_progress=show_progress)
+    worker.cancel()
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import inspect
+import threading
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from .calculatormethods import CalculatorException
+
+
+class WorkerSignals(QObject):
+    """Signals of a Worker, created on the GUI thread so connected slots run there."""
+    progress = pyqtSignal(object, object)  # done, total
+    result = pyqtSignal(object)
+    error = pyqtSignal(object)  # the CalculatorException
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+
+
+class Worker(QRunnable):
+    """Runs function(*args, **kwargs) on a pool thread and reports through its signals."""
+    def __init__(self, function, *args, **kwargs):
+        super().__init__()
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        """True once cancel() has been called."""
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Stop before the next progress step, a worker that has not started yet does not run at all."""
+        self._cancelled.set()
+
+    def run(self):
+        """Run the function, called by the thread pool."""
+        try:
+            if self.cancelled:
+                self.signals.cancelled.emit()
+                return
+            try:
+                result = self.function(*self.args, **self.kwargs)
+                if inspect.isgenerator(result):
+                    result = self._follow(result)
+            except CalculatorException as ce:
+                self.signals.error.emit(ce)
+            except Exception:  # a bug, not bad input, so keep the traceback
+                traceback.print_exc()
+                self.signals.error.emit(CalculatorException())
+            else:
+                if self.cancelled:
+                    self.signals.cancelled.emit()
+                else:
+                    self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+    def _follow(self, steps):
+        """Report the progress of a generator and return its result, or None when cancelled."""
+        try:
+            while True:
+                done, total = next(steps)
+                if self.cancelled:
+                    steps.close()
+                    return None
+                self.signals.progress.emit(done, total)
+        except StopIteration as stop:
+            return stop.value
+
+
+class WorkerPool:
+    """Starts workers on a QThreadPool and keeps them alive until they have finished."""
+    def __init__(self, pool=None):
+        self.pool = QThreadPool.globalInstance() if pool is None else pool
+        self.active = set()
+
+    def start(self, function, *args, on_result=None, on_error=None, on_progress=None, on_finished=None, **kwargs):
+        """Run function(*args, **kwargs) on the pool and return its Worker.
+
+        on_result, on_error and on_progress are called on the GUI thread, and not at all
+        once the worker has been cancelled. on_finished is always called last.
+        """
+        worker = Worker(function, *args, **kwargs)
+        if on_result is not None:
+            worker.signals.result.connect(lambda result: worker.cancelled or on_result(result))
+        if on_error is not None:
+            worker.signals.error.connect(lambda error: worker.cancelled or on_error(error))
+        if on_progress is not None:
+            worker.signals.progress.connect(lambda done, total: worker.cancelled or on_progress(done, total))
+        worker.signals.finished.connect(lambda: self.active.discard(worker))
+        if on_finished is not None:
+            worker.signals.finished.connect(on_finished)
+
+        # Connect before starting, a short calculation can finish before start() returns.
+        self.active.add(worker)
+        self.pool.start(worker)
+        return worker
+
+    def cancel_all(self):
+        """Cancel every worker that has not finished."""
+        for worker in list(self.active):
+            worker.cancel()
+
+    def wait(self, msecs=-1):
+        """Wait for the running workers to finish, return False when msecs ran out first."""
+        return self.pool.waitForDone(msecs)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+bench_engine.py, race engine throughput for an increasing number of workers
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import raceengine  # noqa: E402
+
+
+def write_results(path, rows, seed=0):
+    """Write a result file with random splits."""
+    rng = random.Random(seed)
+    with open(path, 'w') as results_file:
+        for athlete in range(rows):
+            distance = rng.choice((5, 10, 15, 21.1, 30, 40))
+            seconds = int(distance * rng.randrange(180, 480))
+            results_file.write(f'Athlete {athlete},{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d},'
+                               f'{distance}\n')
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='splits in the generated result file')
+    parser.add_argument('--chunk-size', type=int, default=50000, help='lines per chunk')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1, help='largest worker count tried')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'results.csv')
+        write_results(path, args.rows)
+        workers = 1
+        baseline = None
+        while workers <= args.max_workers:
+            with open(os.devnull, 'w') as output:
+                start = time.perf_counter()
+                raceengine.run([path], output, 42.195, cutoff_in_seconds=6 * 3600, workers=workers,
+                               chunk_size=args.chunk_size)
+                rate = args.rows / (time.perf_counter() - start)
+            baseline = baseline or rate
+            print(f'{workers:>3} workers{rate:>14,.0f} rows/sec{rate / baseline:>8.2f}x')
+            workers *= 2
+
+
+if __name__ == '__main__':
+    main()
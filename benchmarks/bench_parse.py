@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+bench_parse.py, compares convert_to_seconds with the bulk timestamp parsers
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import calculatormethods, fixedpoint  # noqa: E402
+
+
+MALFORMED = ('', 'DNF', '1:2:3:4', '12:3x', '1::05', ' ', '-5')
+
+
+def make_timestamps(rows, seed=0, invalid=0.0):
+    """Build a column of random HH:MM:SS, MM:SS and SS timestamps, with a fraction of malformed rows."""
+    rng = random.Random(seed)
+    column = []
+    for _ in range(rows):
+        kind = rng.randrange(3)
+        if rng.random() < invalid:
+            column.append(rng.choice(MALFORMED))
+        elif kind == 0:
+            column.append(f'{rng.randrange(24)}:{rng.randrange(60):02d}:{rng.randrange(60):02d}')
+        elif kind == 1:
+            column.append(f'{rng.randrange(60)}:{rng.randrange(60):02d}')
+        else:
+            column.append(str(rng.randrange(3600)))
+    return column
+
+
+def rows_per_second(function, argument, rows, repeat):
+    """Time function(argument) and return the best throughput out of repeat runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        best = min(best, time.perf_counter() - start)
+    return rows / best
+
+
+def convert_each(column):
+    """Parse a column one timestamp at a time with convert_to_seconds."""
+    seconds = []
+    for timestamp in column:
+        try:
+            seconds.append(calculatormethods.convert_to_seconds(timestamp))
+        except calculatormethods.CalculatorException:
+            seconds.append(0)
+    return seconds
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='number of timestamps to parse')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per parser, the best run is reported')
+    parser.add_argument('--invalid', type=float, default=0.0, help='fraction of malformed rows, e.g. 0.05')
+    args = parser.parse_args()
+
+    column = make_timestamps(args.rows, invalid=args.invalid)
+    buffer = '\n'.join(column).encode('ascii')
+    hundredths = [f'{timestamp}.{index % 100:02d}' for index, timestamp in enumerate(column)]
+
+    results = [
+        ('convert_to_seconds', rows_per_second(convert_each, column, args.rows, args.repeat)),
+        ('parse_timestamps(list)', rows_per_second(calculatormethods.parse_timestamps, column, args.rows, args.repeat)),
+        ('parse_timestamps(bytes)', rows_per_second(calculatormethods.parse_timestamps, buffer, args.rows, args.repeat)),
+        ('check_timestamps(list)', rows_per_second(calculatormethods.check_timestamps, column, args.rows, args.repeat)),
+        ('fixedpoint.parse_column', rows_per_second(fixedpoint.parse_column, column, args.rows, args.repeat)),
+        ('  with hundredths', rows_per_second(fixedpoint.parse_column, hundredths, args.rows, args.repeat)),
+    ]
+    baseline = results[0][1]
+    for name, rate in results:
+        print(f'{name:<26}{rate:>14,.0f} rows/sec{rate / baseline:>8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+bench_results.py, CSV against the columnar binary results format
+
+Compares reading a results CSV row by row with convert_to_seconds, the chunked CSV
+import, loading the binary file and calculating paces from the mapped columns, and
+the chunked CSV export.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import calculatormethods  # noqa: E402
+from app.resultsfile import ResultsFile, export_csv, import_csv  # noqa: E402
+
+
+def make_results(path, rows, seed=0):
+    """Write a CSV of random athlete, time, distance rows."""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='') as results_file:
+        for index in range(rows):
+            results_file.write(f'Athlete {index},{rng.randrange(5)}:{rng.randrange(60):02d}:{rng.randrange(60):02d},'
+                               f'{rng.randrange(1, 4220) / 100}\n')
+
+
+def best_time(function, repeat):
+    """Return the best time of function() in seconds out of repeat runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def read_each(path):
+    """Read a results CSV one row at a time with convert_to_seconds."""
+    names, seconds, distances = [], [], []
+    with open(path, newline='') as results_file:
+        for name, timestamp, distance in csv.reader(results_file):
+            names.append(name)
+            seconds.append(calculatormethods.convert_to_seconds(timestamp))
+            distances.append(float(distance))
+    return names, seconds, distances
+
+
+def import_file(csv_path, path):
+    """Convert a results CSV into a results file."""
+    with open(csv_path, newline='') as csv_file:
+        import_csv(csv_file, path)
+
+
+def load_and_calculate(path):
+    """Map a results file and calculate every pace from the mapped columns."""
+    with ResultsFile.load(path) as results:
+        calculatormethods.calculate_pace_batch(results.seconds, results.distances)
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='rows in the results file')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per benchmark, the best run is reported')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'results.csv')
+        path = os.path.join(directory, 'results.ptr')
+        make_results(csv_path, args.rows)
+        import_file(csv_path, path)
+
+        results = [
+            ('csv, convert_to_seconds', best_time(lambda: read_each(csv_path), args.repeat)),
+            ('csv import (chunked)', best_time(lambda: import_file(csv_path, path), args.repeat)),
+            ('binary load', best_time(lambda: ResultsFile.load(path).close(), args.repeat)),
+            ('binary load + paces', best_time(lambda: load_and_calculate(path), args.repeat)),
+            ('csv export (chunked)', best_time(lambda: export_csv(path, io.StringIO()), args.repeat)),
+        ]
+        print(f'{args.rows:,} rows, csv {os.path.getsize(csv_path):,} bytes, binary {os.path.getsize(path):,} bytes')
+    for name, seconds in results:
+        print(f'{name:<26}{args.rows / seconds:>16,.0f} rows/sec{seconds * 1000:>10.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
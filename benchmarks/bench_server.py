@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+bench_server.py, load generator for the HTTP/JSON calculation service
+
+Starts the service in this process and runs concurrent keep-alive clients against it,
+then reports client side throughput and p50/p99 latency next to the service's /stats.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app.server import CalculationServer, percentile  # noqa: E402
+
+REQUESTS = [
+    ('/pace', {'time': '1:00:00', 'distance': 10}),
+    ('/time', {'pace': '5:00', 'distance': 42.195}),
+    ('/distance', {'time': '1:00:00', 'pace': '5:00'}),
+    ('/add', {'left': '45:10', 'right': '12:00'}),
+    ('/subtract', {'left': '45:10', 'right': '12:00'}),
+]
+
+
+async def request(reader, writer, method, path, payload=None):
+    """Send one request on an open connection and return the decoded JSON response."""
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    writer.write(f'{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+                 f'Content-Length: {len(body)}\r\n\r\n'.encode('latin-1') + body)
+    head = await reader.readuntil(b'\r\n\r\n')
+    length = next(int(line.split(b':', 1)[1]) for line in head.split(b'\r\n')
+                  if line.lower().startswith(b'content-length'))
+    return json.loads(await reader.readexactly(length))
+
+
+async def client(port, count, latencies, seed):
+    """Send count random requests over one connection, recording each latency."""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for _ in range(count):
+        path, payload = rng.choice(REQUESTS)
+        start = time.perf_counter()
+        await request(reader, writer, 'POST', path, payload)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(clients, count, window, max_batch):
+    """Run the load and print the results."""
+    service = CalculationServer(window=window, max_batch=max_batch)
+    server = await service.start('127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, count, latencies, seed) for seed in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    stats = await request(reader, writer, 'GET', '/stats')
+    writer.close()
+    await writer.wait_closed()
+    await asyncio.sleep(0.1)  # let the service see every connection close
+    server.close()
+    await server.wait_closed()
+
+    latencies.sort()
+    print(f'client  {len(latencies) / elapsed:>10,.0f} req/sec    p50 {percentile(latencies, 0.50) * 1000:7.2f} ms'
+          f'    p99 {percentile(latencies, 0.99) * 1000:7.2f} ms')
+    print(f'server  {stats["throughput"]:>10,.0f} req/sec    p50 {stats["p50_ms"]:7.2f} ms'
+          f'    p99 {stats["p99_ms"]:7.2f} ms    batches {sum(stats["batches"].values())}')
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=64, help='concurrent connections')
+    parser.add_argument('--requests', type=int, default=500, help='requests per connection')
+    parser.add_argument('--window-ms', type=float, default=2.0, help='batching window of the service')
+    parser.add_argument('--max-batch', type=int, default=1024, help='largest batch of the service')
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(run(args.clients, args.requests, args.window_ms / 1000, args.max_batch))
+    loop.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+bench_startup.py, import time and time to first result for the core and the GUI
+
+Every measurement runs in a fresh interpreter so nothing is already imported.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+CORE = '''
+import json, time
+start = time.perf_counter()
+from app import calculatormethods
+imported = time.perf_counter()
+calculatormethods.calculate_pace(float(calculatormethods.convert_to_seconds('1:00:00')), 10.0)
+result = time.perf_counter()
+print(json.dumps([imported - start, result - start]))
+'''
+
+GUI = '''
+import json, time
+start = time.perf_counter()
+from app import mainwindow
+imported = time.perf_counter()
+app = mainwindow.QApplication([])
+win = mainwindow.PaceTimeCalculator()
+win.pace_calculator.pace.first_field.setText('1:00:00')
+win.pace_calculator.pace.second_field.setText('10')
+win.pace_button_clicked()
+win.workers.wait()  # the calculation runs on the worker pool
+app.processEvents()  # and its result is shown by a queued signal
+result = time.perf_counter()
+print(json.dumps([imported - start, result - start]))
+'''
+
+
+def measure(script, repeat):
+    """Run the script in fresh interpreters and return the best (import, first result) times."""
+    runs = []
+    with tempfile.TemporaryDirectory() as history:  # keep the benchmark out of the user's history
+        environment = dict(os.environ, QT_QPA_PLATFORM='offscreen',
+                           PACETIME_HISTORY=os.path.join(history, 'history.sqlite3'))
+        for _ in range(repeat):
+            completed = subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=environment,
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+            if completed.returncode != 0:
+                return None
+            runs.append(json.loads(completed.stdout))
+    return min(run[0] for run in runs), min(run[1] for run in runs)
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='fresh interpreters per layer, the best run is reported')
+    args = parser.parse_args()
+
+    for name, script in (('core', CORE), ('gui', GUI)):
+        times = measure(script, args.repeat)
+        if times is None:
+            print(f'{name:<6}unavailable (is PyQt5 installed?)')
+        else:
+            print(f'{name:<6}import {times[0] * 1000:8.2f} ms    first result {times[1] * 1000:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
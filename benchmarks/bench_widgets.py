@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+bench_widgets.py, widget construction time and styling costs of the GUI
+
+Runs on Qt's offscreen platform so no display is needed.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+def per_call(function, count):
+    """Return the average time of function() in milliseconds over count calls."""
+    start = time.perf_counter()
+    for _ in range(count):
+        function()
+    return (time.perf_counter() - start) / count * 1000
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--windows', type=int, default=20, help='main windows to construct')
+    parser.add_argument('--switches', type=int, default=2000, help='focus switches and output state changes')
+    args = parser.parse_args()
+
+    try:
+        from PyQt5.QtWidgets import QApplication
+    except ImportError:
+        print('unavailable (is PyQt5 installed?)')
+        return
+    from app.mainwindow import PaceTimeCalculator
+    from app.ptwidgets import STYLESHEET
+
+    app = QApplication(sys.argv)
+    app.setStyleSheet(STYLESHEET)
+    windows = []
+    history = tempfile.TemporaryDirectory()  # keep the benchmark out of the user's history
+    history_path = os.path.join(history.name, 'history.sqlite3')
+    print(f'window construction  '
+          f'{per_call(lambda: windows.append(PaceTimeCalculator(history_path=history_path)), args.windows):8.3f} ms')
+
+    win = windows[-1]
+    win.show()
+    fields = [win.pace_calculator.pace.first_field, win.pace_calculator.pace.second_field]
+    switches = iter(range(args.switches * 2))
+
+    def switch_focus():
+        fields[next(switches) % 2].setFocus()
+        app.processEvents()
+    print(f'focus switch         {per_call(switch_focus, args.switches):8.3f} ms')
+
+    output = win.pace_calculator.pace.output
+    states = iter(range(args.switches * 2))
+
+    def switch_output():
+        if next(states) % 2:
+            output.set_valid()
+        else:
+            output.set_invalid('INVALID')
+        app.processEvents()
+    print(f'output state change  {per_call(switch_output, args.switches):8.3f} ms')
+    for window in windows:
+        window.close()
+    history.cleanup()
+
+
+if __name__ == '__main__':
+    main()
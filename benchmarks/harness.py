@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+harness.py, throughput baselines for the calculation core and the GUI
+
+Measures rows/sec for parsing, formatting and every batch calculation, and the time to
+construct the main window when PyQt5 is installed. Results are compared against the
+baselines stored in baseline.json (one file per machine, it is not committed), and the
+run fails when any result is worse than its baseline by more than the threshold.
+
+    python benchmarks/harness.py --update-baseline   # record baselines on this machine
+    python benchmarks/harness.py --threshold 0.15    # fail on a slowdown of more than 15%
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from app import calculatormethods  # noqa: E402
+from bench_parse import make_timestamps  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def best_time(function, repeat):
+    """Return the best time of function() in seconds out of repeat runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_core(rows, repeat):
+    """Return {name: rows/sec} for parsing, formatting and the batch calculations."""
+    rng = random.Random(0)
+    column = make_timestamps(rows)
+    buffer = '\n'.join(column).encode('ascii')
+    times = [rng.randrange(600, 30000) for _ in range(rows)]
+    paces = [rng.randrange(120, 600) for _ in range(rows)]
+    distances = [rng.randrange(1, 500) / 10 for _ in range(rows)]
+    benchmarks = {
+        'parse_list': lambda: calculatormethods.parse_timestamps(column),
+        'parse_bytes': lambda: calculatormethods.parse_timestamps(buffer),
+        'format': lambda: calculatormethods.format_timestamps(times),
+        'pace_batch': lambda: calculatormethods.calculate_pace_batch(times, distances, formatted=True),
+        'time_batch': lambda: calculatormethods.calculate_time_batch(paces, distances, formatted=True),
+        'distance_batch': lambda: calculatormethods.calculate_distance_batch(times, paces, formatted=True),
+        'add_batch': lambda: calculatormethods.add_time_batch(times, paces),
+    }
+    return {name: rows / best_time(function, repeat) for name, function in benchmarks.items()}
+
+
+def measure_gui(repeat):
+    """Return {name: windows/sec} for main window construction, or {} when PyQt5 is missing."""
+    try:
+        from PyQt5.QtWidgets import QApplication
+    except ImportError:
+        return {}
+    from app.mainwindow import PaceTimeCalculator
+    from app.ptwidgets import STYLESHEET
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    app.setStyleSheet(STYLESHEET)
+    windows = []
+    with tempfile.TemporaryDirectory() as history:  # keep the benchmark out of the user's history
+        history_path = os.path.join(history, 'history.sqlite3')
+        rate = 1 / best_time(lambda: windows.append(PaceTimeCalculator(history_path=history_path)), repeat)
+        for window in windows:
+            window.close()
+    return {'main_window': rate}
+
+
+def compare(results, baseline, threshold):
+    """Print every result against its baseline and return the names that regressed."""
+    regressions = []
+    for name, rate in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            print(f'{name:<16}{rate:>14,.1f}/sec  (no baseline)')
+            continue
+        change = rate / expected - 1
+        regressed = change < -threshold
+        print(f'{name:<16}{rate:>14,.1f}/sec{change:>+9.1%}{"  REGRESSION" if regressed else ""}')
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200_000, help='rows per core benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per benchmark, the best run is used')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='largest allowed slowdown against the baseline, 0.10 is 10%%')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline file')
+    parser.add_argument('--update-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--no-gui', action='store_true', help='skip the GUI benchmarks')
+    args = parser.parse_args()
+
+    results = measure_core(args.rows, args.repeat)
+    if not args.no_gui:
+        results.update(measure_gui(args.repeat))
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        compare(results, {}, args.threshold)
+        print(f'baseline written to {args.baseline}')
+        return 0
+
+    try:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        baseline = {}
+        print('no baseline yet, run with --update-baseline to record one')
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f'{len(regressions)} regression(s) beyond {args.threshold:.0%}: {", ".join(regressions)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+test_calculatorcache.py, cached pace, time and distance lookups
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import pytest
+
+from app import calculatormethods
+from app.calculatorcache import CalculatorCache
+from app.calculatormethods import CalculatorException
+
+
+def test_results_match_the_calculations():
+    cache = CalculatorCache(maxsize=16)
+    for _ in range(2):
+        assert cache.pace('1:00:00', '10') == calculatormethods.calculate_pace(3600, 10.0) == '00:06:00'
+        assert cache.time('5:00', 42.195) == calculatormethods.calculate_time(300, 42.195) == '03:30:58'
+        assert cache.distance('1:00:00', '5:00') == calculatormethods.calculate_distance(3600, 300) == '12.00'
+    info = cache.info()
+    assert (info.hits, info.misses, info.currsize) == (3, 3, 3)
+    for _ in range(2):
+        with pytest.raises(CalculatorException):
+            cache.distance('1:00', '5:00')
+    assert cache.info().currsize == 3  # errors are not cached
+    cache.clear()
+    assert cache.info().currsize == 0
+
+
+def test_prewarm_fills_the_cache():
+    cache = CalculatorCache()
+    cache.prewarm(paces=range(300, 302), distances=[5.0, 10.0])
+    assert cache.info().currsize == 8
+    assert cache.time('5:01', '10') == '00:50:10'
+    assert cache.pace('50:00', '10') == '00:05:00'
+    assert cache.info().hits == 2
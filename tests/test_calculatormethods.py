@@ -0,0 +1,317 @@
+"""
+test_calculatormethods.py, property checks for the calculation core
+
+Every property is checked against a few thousand random cases from a fixed seed,
+so failures are reproducible.
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import random
+from array import array
+
+import pytest
+
+from app import calculatormethods, expressions, fixedpoint
+from app.calculatormethods import CalculatorException
+
+CASES = 2000
+
+
+@pytest.fixture
+def rng():
+    return random.Random(2020)
+
+
+def random_timestamp(rng):
+    """Return a random HH:MM:SS, MM:SS or SS timestamp and its seconds."""
+    hours, minutes, seconds = rng.randrange(100), rng.randrange(60), rng.randrange(60)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return f'{hours}:{minutes:02d}:{seconds:02d}', hours * 3600 + minutes * 60 + seconds
+    elif kind == 1:
+        return f'{minutes}:{seconds}', minutes * 60 + seconds
+    return str(seconds), seconds
+
+
+def test_timestamp_round_trip(rng):
+    for _ in range(CASES):
+        seconds = rng.randrange(400000)
+        assert calculatormethods.convert_to_seconds(calculatormethods.convert_to_timestamp(seconds)) == seconds
+
+
+def test_convert_to_seconds_grammar(rng):
+    for _ in range(CASES):
+        timestamp, seconds = random_timestamp(rng)
+        assert calculatormethods.convert_to_seconds(timestamp) == seconds
+
+
+def test_convert_to_timestamp_is_zero_padded():
+    assert calculatormethods.convert_to_timestamp(0) == '00:00:00'
+    assert calculatormethods.convert_to_timestamp(3723) == '01:02:03'
+    assert calculatormethods.convert_to_timestamp(360005) == '100:00:05'
+    assert calculatormethods.convert_to_timestamp(3.5) == '00:00:03'
+    assert calculatormethods.convert_to_timestamp(360005.9) == '100:00:05'
+    for seconds in (float('inf'), float('nan'), None):
+        with pytest.raises(CalculatorException):
+            calculatormethods.convert_to_timestamp(seconds)
+
+
+@pytest.mark.parametrize('timestamp', ['', 'abc', '1:2:3:4', '1::2', ':', '1:x'])
+def test_convert_to_seconds_invalid(timestamp):
+    with pytest.raises(CalculatorException):
+        calculatormethods.convert_to_seconds(timestamp)
+
+
+def test_parse_timestamps_matches_convert_to_seconds(rng):
+    column = [random_timestamp(rng)[0] for _ in range(CASES)] + ['', 'abc', '1:2:3:4']
+    parsed = calculatormethods.parse_timestamps(column)
+    assert parsed.errors == [CASES, CASES + 1, CASES + 2]
+    assert calculatormethods.parse_timestamps(['٣:٠٥', '1:²', '10:60', '1:02:3']) == \
+        calculatormethods.ParsedColumn(array('q', [185, 0, 660, 3723]), [1])
+    assert list(parsed.seconds[:CASES]) == [calculatormethods.convert_to_seconds(stamp) for stamp in column[:CASES]]
+    buffer = '\n'.join(column[:CASES]).encode('ascii')
+    assert calculatormethods.parse_timestamps(buffer).seconds == parsed.seconds[:CASES]
+
+
+def test_rows_beyond_int64_are_errors():
+    huge = ['9' * 20, '9' * 16 + ':00:00', '1:' + '9' * 19, '9' * 19 + ':00']
+    column = ['1:00', '9' * 18, *huge, '2:03:04']
+    parsed = calculatormethods.parse_timestamps(column)
+    assert list(parsed.seconds) == [60, 10 ** 18 - 1, 0, 0, 0, 0, 7384]
+    assert parsed.errors == [2, 3, 4, 5]
+    assert calculatormethods.parse_timestamps('\n'.join(column).encode('ascii')) == parsed
+    checked = calculatormethods.check_timestamps(column)
+    assert checked.seconds == parsed.seconds
+    assert list(checked.status) == [calculatormethods.OK] * 2 + [calculatormethods.BAD_NUMBER] * 4 + \
+        [calculatormethods.OK]
+    assert fixedpoint.parse_column(column, scale=1) == parsed
+    assert fixedpoint.parse_column(['9' * 17], scale=1000).errors == [0]  # fits as seconds, not as milliseconds
+    with pytest.raises(CalculatorException):
+        expressions.evaluate('1:00 + ' + '9' * 20)
+
+
+@pytest.mark.parametrize('buffer, expected', [
+    (b'', []),
+    (b'\n', [0]),
+    (b'1:00\r\n2:00\r3:00\n', [60, 120, 180]),
+    (b'1:00\n\n', [60, 0]),
+    (b'5\xb2\n\xd9\xa3\n1:2:3\n12:3:45\n0:75\n\x85', [0, 0, 3723, 43425, 75, 0]),
+])
+def test_parse_timestamps_reads_lines_like_splitlines(buffer, expected):
+    # Empty lines and the lines with \xb2 (a superscript digit), an Arabic digit or \x85 can not be parsed.
+    for column in (buffer, bytearray(buffer), memoryview(buffer)):
+        parsed = calculatormethods.parse_timestamps(column)
+        assert list(parsed.seconds) == expected
+        assert len(parsed.seconds) == len(buffer.splitlines())
+    rows = [row.decode('latin-1') for row in buffer.splitlines()]
+    assert calculatormethods.check_timestamps(buffer).seconds == calculatormethods.check_timestamps(rows).seconds
+
+
+def test_format_timestamps_matches_convert_to_timestamp(rng):
+    seconds = [rng.randrange(360000) for _ in range(CASES)]
+    text = calculatormethods.format_timestamps(seconds).decode('ascii')
+    assert [text[offset:offset + 8] for offset in range(0, len(text), 8)] == \
+        [calculatormethods.convert_to_timestamp(value) for value in seconds]
+    assert calculatormethods.format_timestamps([360000, -1]) == b'*' * 16
+    assert calculatormethods.format_timestamps([6000], short=True) == b'*****'
+    assert calculatormethods.format_timestamps([62], short=True) == b'01:02'
+
+
+def test_add_time_algebra(rng):
+    for _ in range(CASES):
+        (a, a_seconds), (b, _), (c, _) = (random_timestamp(rng) for _ in range(3))
+        assert calculatormethods.add_time(a, b) == calculatormethods.add_time(b, a)
+        assert calculatormethods.add_time(calculatormethods.add_time(a, b), c) == \
+            calculatormethods.add_time(a, calculatormethods.add_time(b, c))
+        assert calculatormethods.add_time(a, '0') == calculatormethods.convert_to_timestamp(a_seconds)
+
+
+def test_subtract_time_undoes_add_time(rng):
+    for _ in range(CASES):
+        (a, a_seconds), (b, b_seconds) = random_timestamp(rng), random_timestamp(rng)
+        assert calculatormethods.subtract_time(calculatormethods.add_time(a, b), b) == \
+            calculatormethods.convert_to_timestamp(a_seconds)
+        if a_seconds < b_seconds:
+            with pytest.raises(CalculatorException):
+                calculatormethods.subtract_time(a, b)
+
+
+def test_pace_time_distance_consistency(rng):
+    for _ in range(CASES):
+        pace = rng.randrange(60, 900)
+        distance = rng.randrange(10, 1000) / 10
+        time = calculatormethods.calculate_time(float(pace), distance)
+        time_in_seconds = calculatormethods.convert_to_seconds(time)
+
+        # The time is truncated by under a second and the distance is at least 1, so the pace back
+        # from it is within one second of the original.
+        pace_back = calculatormethods.convert_to_seconds(calculatormethods.calculate_pace(time_in_seconds, distance))
+        assert abs(pace_back - pace) <= 1
+        if time_in_seconds >= pace:
+            distance_back = float(calculatormethods.calculate_distance(time_in_seconds, float(pace)))
+            assert abs(distance_back - distance) <= 1 / pace + 0.005
+
+
+def test_calculate_distance_time_less_than_pace():
+    with pytest.raises(CalculatorException):
+        calculatormethods.calculate_distance(100.0, 300.0)
+
+
+def test_divide_by_zero_raises_calculator_exception():
+    with pytest.raises(CalculatorException, match='Divide by 0'):
+        calculatormethods.calculate_pace(3600.0, 0.0)
+    with pytest.raises(CalculatorException, match='Divide by 0'):
+        calculatormethods.calculate_distance(3600.0, 0.0)
+
+
+def test_calculations_are_exact():
+    # 4.35 * 300 is 1304.9999999999998 and 10 / 0.4 is 25.000000000000004 in floats.
+    assert calculatormethods.calculate_time(300.0, 4.35) == '00:21:45'
+    assert calculatormethods.calculate_time_batch([300], [4.35]).values[0] == 1305
+    assert calculatormethods.calculate_pace(10.0, 0.4) == '00:00:25'
+    assert calculatormethods.calculate_pace(5.0, 2.0) == '00:00:02'  # ties round to even
+    assert calculatormethods.calculate_pace_batch([5, 7], [2.0, 2.0]).values.tolist() == [2, 4]
+    assert calculatormethods.calculate_distance(43.0, 40.0) == '1.08'  # 1.075 is a tie, 1.07 in floats
+    assert calculatormethods.calculate_distance_batch([43], [40], formatted=True).formatted == ['1.08']
+
+
+def test_batches_match_scalar_functions(rng):
+    times = [rng.randrange(0, 30000) for _ in range(CASES)]
+    paces = [rng.randrange(0, 900) for _ in range(CASES)]
+    distances = [rng.randrange(0, 500) / 10 for _ in range(CASES)]
+
+    batch = calculatormethods.calculate_pace_batch(times, distances, formatted=True)
+    for time, distance, value, ok, text in zip(times, distances, *batch):
+        assert ok == (distance > 0)
+        if ok:
+            assert text == calculatormethods.calculate_pace(float(time), distance)
+            assert value == calculatormethods.convert_to_seconds(text)
+
+    batch = calculatormethods.calculate_time_batch(paces, distances, formatted=True)
+    for pace, distance, text in zip(paces, distances, batch.formatted):
+        assert text == calculatormethods.calculate_time(float(pace), distance)
+
+    batch = calculatormethods.calculate_distance_batch(times, paces, formatted=True)
+    for time, pace, ok, text in zip(times, paces, batch.valid, batch.formatted):
+        assert ok == (0 < pace <= time)
+        if ok:
+            assert text == calculatormethods.calculate_distance(float(time), float(pace))
+
+
+def test_batches_mark_non_finite_rows_invalid():
+    inf, nan = float('inf'), float('nan')
+    batch = calculatormethods.calculate_pace_batch([3600, 3600, 3600, inf, 3600], [inf, 1e-320, nan, 10, 10])
+    assert list(batch.valid) == [0, 0, 0, 0, 1]
+    batch = calculatormethods.calculate_time_batch([300, 300, nan, 1e300], [inf, 10, 1, 1e300])
+    assert list(batch.valid) == [0, 1, 0, 0]
+    batch = calculatormethods.calculate_distance_batch([3600, inf], [1e-320, 300], formatted=True)
+    assert batch.formatted == ['INVALID', 'INVALID']
+
+
+@pytest.mark.parametrize('timestamp, status, seconds', [
+    ('1:02:03', calculatormethods.OK, 3723),
+    ('90:00', calculatormethods.OK, 5400),
+    ('59', calculatormethods.OK, 59),
+    ('1:2:3:4', calculatormethods.BAD_FIELD_COUNT, None),
+    ('', calculatormethods.BAD_NUMBER, None),
+    ('1::2', calculatormethods.BAD_NUMBER, None),
+    ('-5', calculatormethods.BAD_NUMBER, None),
+    ('1:x', calculatormethods.BAD_NUMBER, None),
+    ('1:75:00', calculatormethods.OUT_OF_RANGE, 8100),
+    ('1:60', calculatormethods.OUT_OF_RANGE, 120),
+    (None, calculatormethods.BAD_NUMBER, None),
+    (b'1:00', calculatormethods.BAD_NUMBER, None),
+])
+def test_check_timestamp(timestamp, status, seconds):
+    assert calculatormethods.check_timestamp(timestamp) == (status, seconds)
+
+
+def test_check_timestamps_matches_parse_timestamps(rng):
+    column = [random_timestamp(rng)[0] for _ in range(CASES)] + ['', 'abc', '1:2:3:4', '1:75:00']
+    checked = calculatormethods.check_timestamps(column)
+    parsed = calculatormethods.parse_timestamps(column)
+    assert checked.seconds == parsed.seconds
+    assert list(checked.status) == [calculatormethods.OK] * CASES + [
+        calculatormethods.BAD_NUMBER, calculatormethods.BAD_NUMBER, calculatormethods.BAD_FIELD_COUNT,
+        calculatormethods.OUT_OF_RANGE]
+    assert parsed.errors == [CASES, CASES + 1, CASES + 2]  # out of range minutes are still added up
+    assert calculatormethods.check_timestamps(b'1:02:03\nabc').status == calculatormethods.check_timestamps(
+        ['1:02:03', 'abc']).status
+
+
+def test_check_functions_match_raising_functions(rng):
+    for _ in range(CASES):
+        (a, a_seconds), (b, b_seconds) = random_timestamp(rng), random_timestamp(rng)
+        assert calculatormethods.check_add(a, b) == (calculatormethods.OK, calculatormethods.add_time(a, b))
+        if a_seconds >= b_seconds:
+            assert calculatormethods.check_subtract(a, b) == (calculatormethods.OK,
+                                                              calculatormethods.subtract_time(a, b))
+        else:
+            result = calculatormethods.check_subtract(a, b)
+            assert calculatormethods.MESSAGES[result.status] == 'Left < Right'
+
+        distance = rng.randrange(1, 500) / 10
+        assert calculatormethods.check_pace(a_seconds, distance).value == \
+            calculatormethods.calculate_pace(float(a_seconds), distance)
+        assert calculatormethods.check_time(b_seconds, distance).value == \
+            calculatormethods.calculate_time(float(b_seconds), distance)
+        if b_seconds:
+            result = calculatormethods.check_distance(a_seconds, b_seconds)
+            if a_seconds < b_seconds:
+                assert calculatormethods.MESSAGES[result.status] == 'Time < Pace'
+            else:
+                assert result.value == calculatormethods.calculate_distance(float(a_seconds), float(b_seconds))
+
+
+def test_check_functions_report_error_kinds():
+    assert calculatormethods.check_add('1:2:3:4', 'x') == (calculatormethods.BAD_FIELD_COUNT, None)
+    assert calculatormethods.check_subtract('1:00', 'x') == (calculatormethods.BAD_NUMBER, None)
+    assert calculatormethods.check_pace(3600, 0) == (calculatormethods.DIVIDE_BY_ZERO, None)
+    assert calculatormethods.check_distance(3600, 0) == (calculatormethods.DIVIDE_BY_ZERO, None)
+    assert calculatormethods.check_time(-1, 10) == (calculatormethods.NEGATIVE_RESULT, None)
+    assert calculatormethods.MESSAGES[calculatormethods.DIVIDE_BY_ZERO] == 'Divide by 0'
+
+
+def test_fractions_of_a_second_are_used_by_every_path():
+    paces, times, distances = [300.9, 299.5, 0.5], [3600.5, 3600.25, 1.5], [10.0, 1.0, 2.0]
+    for pace, distance, expected in zip(paces, distances, ['00:50:09', '00:04:59', '00:00:01']):
+        assert calculatormethods.calculate_time(pace, distance) == expected
+    assert calculatormethods.calculate_time_batch(paces, distances, formatted=True).formatted == [
+        '00:50:09', '00:04:59', '00:00:01']
+    for time, distance, expected in zip(times, distances, ['00:06:00', '01:00:00', '00:00:01']):
+        assert calculatormethods.calculate_pace(time, distance) == expected
+    assert calculatormethods.calculate_pace_batch(times, distances, formatted=True).formatted == [
+        '00:06:00', '01:00:00', '00:00:01']
+    for time, pace, expected in zip(times, paces, ['11.97', '12.02', '3.00']):
+        assert calculatormethods.calculate_distance(time, pace) == expected
+    assert calculatormethods.calculate_distance_batch(times, paces, formatted=True).formatted == [
+        '11.97', '12.02', '3.00']
+    assert list(calculatormethods.calculate_distance_batch(array('d', times), array('q', [300, 300, 1])).values) == [
+        12.0, 12.0, 1.5]
+
+
+def test_check_functions_never_raise():
+    inf, nan = float('inf'), float('nan')
+    for check in (calculatormethods.check_pace, calculatormethods.check_time, calculatormethods.check_distance):
+        for first, second in [(3600, nan), (nan, 300), (3600, inf), (3600, '10'), (10 ** 400, 1)]:
+            assert check(first, second) == (calculatormethods.BAD_NUMBER, None)
+    assert calculatormethods.check_time(300, 1e303) == (calculatormethods.BAD_NUMBER, None)
+    assert calculatormethods.check_pace(3600, 1e-320) == (calculatormethods.DIVIDE_BY_ZERO, None)  # 0 units
+    assert calculatormethods.check_distance(3600, 0.0) == (calculatormethods.DIVIDE_BY_ZERO, None)
+    assert calculatormethods.check_distance(3600, 1e-320).status == calculatormethods.OK  # a fraction, not 0
+    assert calculatormethods.check_add(5, 6) == (calculatormethods.BAD_NUMBER, None)
+    assert calculatormethods.check_subtract('1:00', None) == (calculatormethods.BAD_NUMBER, None)
+    for timestamp in ('9' * 20, '1:' + '9' * 19, '9' * 16 + ':00:00'):  # beyond an int64 of seconds
+        assert calculatormethods.check_timestamp(timestamp) == (calculatormethods.BAD_NUMBER, None)
+        assert calculatormethods.check_add('1', timestamp) == (calculatormethods.BAD_NUMBER, None)
+        assert calculatormethods.check_subtract(timestamp, '1') == (calculatormethods.BAD_NUMBER, None)
+    largest = str(2 ** 63 - 1)
+    assert calculatormethods.check_add(largest, largest).status == calculatormethods.OK
+
+
+def test_out_of_range_is_still_calculated():
+    assert calculatormethods.check_add('1:75', '0') == (calculatormethods.OUT_OF_RANGE,
+                                                         calculatormethods.add_time('1:75', '0'))
+    assert calculatormethods.check_subtract('1:75', '0:10') == (calculatormethods.OUT_OF_RANGE, '00:02:05')
+    assert calculatormethods.check_add('1:75', 'x') == (calculatormethods.BAD_NUMBER, None)
@@ -0,0 +1,63 @@
+"""
+test_cli.py, records read from stdin and the results written to stdout
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import io
+import json
+
+from app import cli
+from app.calculatorcache import CalculatorCache
+
+
+def run(argv, text, monkeypatch):
+    output = io.StringIO()
+    monkeypatch.setattr('sys.stdin', io.StringIO(text))
+    monkeypatch.setattr('sys.stdout', output)
+    cli.main(argv)
+    return output.getvalue()
+
+
+def test_csv_records_to_output(monkeypatch):
+    text = ('pace,1:00:00,10\n'
+            'TIME, 5:00 ,42.195\n'
+            '\n'
+            'distance,1:00,5:00\n'
+            'add,45:10,12:00\n'
+            'subtract,12:00,45:10\n'
+            'multiply,45:10,3\n'
+            'divide,45:10,0\n'
+            'jump,1,2\n'
+            'pace,1:00:00\n')
+    expected = ('pace,1:00:00,10,00:06:00,\n'
+                'TIME, 5:00 ,42.195,03:30:58,\n'
+                'distance,1:00,5:00,,Time < Pace\n'
+                'add,45:10,12:00,00:57:10,\n'
+                'subtract,12:00,45:10,,Left < Right\n'
+                'multiply,45:10,3,02:15:30,\n'
+                'divide,45:10,0,,Divide by 0\n'
+                'jump,1,2,,INVALID\n'
+                'pace,1:00:00,,,INVALID\n')
+    assert run([], text, monkeypatch) == expected
+    assert run(['--cache-size', '16'], text, monkeypatch) == expected
+
+
+def test_jsonl_records_to_output(monkeypatch):
+    text = '{"operation": "time", "first": "5:00", "second": 42.195}\nnot json\n'
+    assert [json.loads(line) for line in run(['--format', 'jsonl'], text, monkeypatch).splitlines()] == [
+        {'operation': 'time', 'first': '5:00', 'second': '42.195', 'result': '03:30:58'},
+        {'operation': '', 'first': '', 'second': '', 'error': 'INVALID'},
+    ]
+    assert run(['--format', 'jsonl', '--output', 'csv'], text, monkeypatch) == (
+        'time,5:00,42.195,03:30:58,\n,,,,INVALID\n')
+
+
+def test_seconds_are_passed_exactly():
+    cache = CalculatorCache()
+    operations = dict(cli.OPERATIONS, pace=cache.pace, time=cache.time, distance=cache.distance)
+    records = [('time', '99999999999999999999999', '5'), ('pace', '99999999999999999999999', '1'),
+               ('distance', '99999999999999999999999', '1')]
+    expected = ['138888888888888888888:53:15', '27777777777777777777:46:39', '99999999999999999999999.00']
+    for table in (cli.OPERATIONS, operations):
+        assert [result for _, _, _, result, _ in cli.calculate(records, table)] == expected
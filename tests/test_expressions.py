@@ -0,0 +1,53 @@
+"""
+test_expressions.py, time arithmetic with any number of operands
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import pytest
+
+from app import expressions
+from app.calculatormethods import CalculatorException
+
+
+def test_tokenize():
+    assert expressions.tokenize(' 1:02:03+45:10 *3 - 12:00/2.5 ') == [
+        '1:02:03', '+', '45:10', '*', '3', '-', '12:00', '/', '2.5']
+    with pytest.raises(CalculatorException):
+        expressions.tokenize('1:00 + x')
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('1:02:03 + 45:10 * 3 - 12:00 / 2', '03:11:33'),
+    ('10:00 - 1:00 * 2 + 30', '00:08:30'),
+    ('1:00 / 7 * 7', '00:01:00'),  # exact, no error from dividing first
+    ('0:01 * 2.5', '00:00:02'),  # half to even
+    ('0:01 * 3.5', '00:00:04'),
+    ('0 * ' + '9' * 400, '00:00:00'),
+    ('1 * ' + '9' * 30, '277777777777777777777777777:46:39'),
+])
+def test_precedence_and_exact_factors(expression, expected):
+    assert expressions.evaluate(expression) == expected
+
+
+@pytest.mark.parametrize('expression, message', [
+    ('1:00 / 0', 'Divide by 0'),
+    ('1:00 / 0.0', 'Divide by 0'),
+    ('1:00 - 2:00', 'Negative time'),
+    ('1:00 * 2 - 2:01', 'Negative time'),
+    ('1:00 +', 'INVALID'),
+    ('1:00 * 1:00', 'INVALID'),
+    ('1:00 * .', 'INVALID'),
+    ('1:00 + * 2', 'INVALID'),
+    ('1:75:00 + x', 'INVALID'),
+])
+def test_errors(expression, message):
+    with pytest.raises(CalculatorException) as error:
+        expressions.evaluate(expression)
+    assert str(error.value) == message
+
+
+def test_sum_times():
+    assert expressions.sum_times(['5:00', '4:59', '1:05:01']) == '01:15:00'
+    with pytest.raises(CalculatorException):
+        expressions.sum_times(['5:00', 'x'])
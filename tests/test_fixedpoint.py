@@ -0,0 +1,86 @@
+"""
+test_fixedpoint.py, property checks for the fixed-point times
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import random
+from decimal import Decimal
+
+import pytest
+
+from app import calculatormethods, fixedpoint
+from app.calculatormethods import CalculatorException
+
+CASES = 2000
+
+
+@pytest.fixture
+def rng():
+    return random.Random(2020)
+
+
+@pytest.mark.parametrize('rounding', fixedpoint.ROUNDING_MODES)
+def test_divide_matches_decimal(rng, rounding):
+    for _ in range(CASES):
+        numerator, denominator = rng.randrange(-10 ** 6, 10 ** 6), rng.choice([-1, 1]) * rng.randrange(1, 1000)
+        expected = (Decimal(numerator) / Decimal(denominator)).quantize(Decimal(1), rounding=rounding)
+        assert fixedpoint.divide(numerator, denominator, rounding) == int(expected)
+
+
+def test_divide_by_zero():
+    with pytest.raises(CalculatorException, match='Divide by 0'):
+        fixedpoint.divide(1, 0)
+
+
+@pytest.mark.parametrize('scale', [fixedpoint.CENTISECONDS, fixedpoint.MILLISECONDS])
+def test_format_and_parse_round_trip(rng, scale):
+    for _ in range(CASES):
+        ticks = rng.randrange(360000 * scale)
+        assert fixedpoint.parse(fixedpoint.format_ticks(ticks, scale), scale) == ticks
+
+
+def test_parse_rounds_long_fractions():
+    assert fixedpoint.parse('59.999') == 6000
+    assert fixedpoint.parse('1.005') == 100  # ties to even
+    assert fixedpoint.parse('1.005', rounding=fixedpoint.ROUND_HALF_UP) == 101
+    assert fixedpoint.parse('1:02:03.4', fixedpoint.MILLISECONDS) == 3723400
+
+
+def test_parse_column_matches_parse(rng):
+    column = [fixedpoint.format_ticks(rng.randrange(36000000)) for _ in range(CASES)]
+    column += ['1:2:3', ' 5 ', '12:3:45', '120:00', '5.', '1:02:03.4567', '٣:٠٥']  # valid, not the usual layout
+    invalid = ['', '1::2', ':5', '1:²', '-1', '1.2.3', '1:2:3:4', '.5x']
+    parsed = fixedpoint.parse_column(column + invalid)
+    assert list(parsed.seconds[:len(column)]) == [fixedpoint.parse(timestamp) for timestamp in column]
+    assert parsed.errors == list(range(len(column), len(column) + len(invalid)))
+    for timestamp in invalid:
+        with pytest.raises(CalculatorException):
+            fixedpoint.parse(timestamp)
+
+
+def test_parse_column_matches_parse_timestamps(rng):
+    column = [f'{rng.randrange(100)}:{rng.randrange(60):02d}:{rng.randrange(60):02d}' for _ in range(CASES)]
+    parsed = fixedpoint.parse_column(column, scale=1)
+    assert parsed.seconds == calculatormethods.parse_timestamps(column).seconds
+
+
+def test_calculations_do_not_drift(rng):
+    # A pace to a time and back, over every distance to a thousandth, gives the pace again.
+    for _ in range(CASES):
+        pace = rng.randrange(6000, 90000)  # hundredths
+        distance = fixedpoint.to_distance_units(rng.randrange(1, 100000) / 1000)
+        time = fixedpoint.calculate_time(pace, distance)
+        assert abs(fixedpoint.calculate_pace(time, distance) - pace) * distance <= fixedpoint.DISTANCE_SCALE
+
+
+def test_batches_match_scalar_functions(rng):
+    times = [rng.randrange(0, 3000000) for _ in range(CASES)]
+    paces = [rng.randrange(0, 90000) for _ in range(CASES)]
+    distances = [fixedpoint.to_distance_units(rng.randrange(0, 50000) / 1000) for _ in range(CASES)]
+    batch = fixedpoint.calculate_pace_batch(times, distances)
+    assert [value for value, ok in zip(*batch[:2]) if ok] == \
+        [fixedpoint.calculate_pace(time, distance) for time, distance in zip(times, distances) if distance > 0]
+    batch = fixedpoint.calculate_time_batch(paces, distances, fixedpoint.ROUND_DOWN)
+    assert list(batch.values) == [fixedpoint.calculate_time(pace, distance, fixedpoint.ROUND_DOWN)
+                                  for pace, distance in zip(paces, distances)]
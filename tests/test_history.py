@@ -0,0 +1,51 @@
+"""
+test_history.py, records written to the history and read back into the log
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import sqlite3
+
+from app.history import History, format_record
+
+
+def test_entries_reload_as_they_were_typed(tmp_path):
+    path = str(tmp_path / 'history.sqlite3')
+    history = History(path)
+    history.record_entry('Pace', '1:00:00', '10km', '00:06:00')
+    history.record_entry('Time', '5:00', '3.1 mi', '00:15:30')
+    history.record_entry('Time', '5:00', '42.195', '03:30:58')
+    history.record_entry('Distance', '1:00:00', '5:00', '12.00')
+    history.record_entry('*', '45:10', '3', '02:15:30')
+    history.record_entry('=', '1:00 + 45:10 * 3', '', '02:16:30')
+    history.close()
+
+    history = History(path)
+    assert [format_record(record) for record in reversed(history.page())] == [
+        ('Pace', '01:00:00', '10km', '00:06:00'),
+        ('Time', '00:05:00', '3.1mi', '00:15:30'),
+        ('Time', '00:05:00', '42.195', '03:30:58'),
+        ('Distance', '01:00:00', '00:05:00', '12.00'),
+        ('*', '00:45:10', '3', '02:15:30'),
+        ('=', '1:00 + 45:10 * 3', '', '02:16:30'),
+    ]
+    history.close()
+
+
+def test_opens_a_history_without_units_or_expressions(tmp_path):
+    path = str(tmp_path / 'history.sqlite3')
+    with sqlite3.connect(path) as connection:
+        connection.execute('CREATE TABLE history (id INTEGER PRIMARY KEY, created REAL, operation TEXT, '
+                           'first REAL, second REAL, output REAL)')
+        connection.execute("INSERT INTO history VALUES (1, 0, 'pace', 3600, 10, 360)")
+    connection.close()
+
+    history = History(path)
+    history.record_entry('Pace', '1:00:00', '10mi', '00:06:00')
+    history.record_entry('=', '1:00 * 2', '', '00:02:00')
+    assert [format_record(record) for record in history.page()] == [
+        ('=', '1:00 * 2', '', '00:02:00'),
+        ('Pace', '01:00:00', '10mi', '00:06:00'),
+        ('Pace', '01:00:00', '10', '00:06:00'),
+    ]
+    history.close()
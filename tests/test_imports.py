@@ -0,0 +1,26 @@
+"""
+test_imports.py, every module imports on its own in a fresh interpreter
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import importlib.util
+import os
+import pkgutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+MODULES = sorted(module.name for module in pkgutil.iter_modules([os.path.join(ROOT, 'app')]))
+GUI = {'calculators', 'mainwindow', 'ptlogging', 'ptwidgets', 'squadtable', 'workers'}
+
+
+@pytest.mark.parametrize('module', MODULES)
+def test_module_imports_first(module):
+    if module in GUI and importlib.util.find_spec('PyQt5') is None:
+        pytest.skip('PyQt5 is not installed')
+    completed = subprocess.run([sys.executable, '-c', f'import app.{module}'], cwd=ROOT,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    assert completed.returncode == 0, completed.stderr
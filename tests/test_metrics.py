@@ -0,0 +1,112 @@
+"""
+test_metrics.py, checks for the timers, counters, exporters and sampling profiler
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import json
+import threading
+
+from app import calculatormethods
+from app.metrics import METRICS, Metrics
+
+
+def test_disabled_metrics_collect_nothing():
+    metrics = Metrics()
+    square = metrics.timed('square')(lambda value: value * value)
+    assert square(3) == 9
+    metrics.increment('calls')
+    with metrics.timer('block'):
+        pass
+    assert metrics.snapshot() == {'counters': {}, 'timers': {}}
+
+
+def test_enabled_metrics_count_and_time():
+    metrics = Metrics(enabled=True)
+    square = metrics.timed('square')(lambda value: value * value)
+    for value in range(5):
+        square(value)
+    metrics.increment('calls', 2)
+    with metrics.timer('block'):
+        pass
+    snapshot = metrics.snapshot()
+    assert snapshot['counters'] == {'calls': 2}
+    assert snapshot['timers']['square']['calls'] == 5
+    assert snapshot['timers']['block']['calls'] == 1
+    assert snapshot['timers']['square']['max'] <= snapshot['timers']['square']['total']
+
+
+def test_exports(tmp_path):
+    metrics = Metrics(enabled=True)
+    metrics.increment('cli.records', 3)
+    metrics.observe('compute.pace', 0.5)
+    metrics.observe('compute.pace', 0.25)
+
+    metrics.write(str(tmp_path / 'metrics.prom'))
+    text = (tmp_path / 'metrics.prom').read_text()
+    assert '# TYPE pacetime_cli_records_total counter\npacetime_cli_records_total 3\n' in text
+    assert 'pacetime_compute_pace_seconds_count 2\n' in text
+    assert 'pacetime_compute_pace_seconds_sum 0.750000000\n' in text
+    assert 'pacetime_compute_pace_seconds_max 0.500000000\n' in text
+
+    path = str(tmp_path / 'metrics.jsonl')
+    metrics.write(path)
+    metrics.write(path)
+    lines = [json.loads(line) for line in open(path)]
+    assert len(lines) == 4
+    assert lines[1]['name'] == 'compute.pace' and lines[1]['calls'] == 2
+
+
+def test_updates_from_many_threads_are_not_lost():
+    metrics = Metrics(enabled=True)
+
+    def update():
+        for _ in range(20000):
+            metrics.observe('shared', 0.001)
+            metrics.increment('shared')
+
+    threads = [threading.Thread(target=update) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    snapshot = metrics.snapshot()
+    assert snapshot['counters']['shared'] == snapshot['timers']['shared']['calls'] == 8 * 20000
+
+
+def test_calculatormethods_are_instrumented():
+    METRICS.reset()
+    METRICS.enable()
+    try:
+        calculatormethods.calculate_pace(3600.0, 10.0)
+        calculatormethods.calculate_pace_batch([3600], [10.0], formatted=True)
+    finally:
+        METRICS.disable()
+    timers = METRICS.snapshot()['timers']
+    METRICS.reset()
+    assert timers['compute.pace']['calls'] == 1
+    assert timers['compute.pace_batch']['calls'] == 1
+    assert timers['format_column']['calls'] == 1
+
+
+def test_profiler_samples_main_and_other_threads(tmp_path):
+    def spin():
+        total = 0
+        for value in range(3_000_000):
+            total += value
+        return total
+
+    metrics = Metrics()
+    metrics.start_profiler(interval=0.001)
+    spin()
+    profiler = metrics.stop_profiler(str(tmp_path / 'profile.txt'))
+    assert metrics.profiler is None
+    assert any('spin' in stack for stack in profiler.samples)
+    assert (tmp_path / 'profile.txt').read_text().endswith('\n')
+
+    worker = threading.Thread(target=spin)
+    worker.start()
+    metrics.start_profiler(interval=0.001, thread=worker)
+    worker.join()
+    profiler = metrics.stop_profiler()
+    assert all('spin' in stack for stack in profiler.samples)
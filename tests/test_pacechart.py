@@ -0,0 +1,39 @@
+"""
+test_pacechart.py, pace charts saved to a file and mapped back into memory
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import pytest
+
+from app import calculatormethods
+from app.calculatormethods import CalculatorException
+from app.pacechart import PaceChart
+
+
+def test_save_load_close_round_trip(tmp_path):
+    path = str(tmp_path / 'chart.bin')
+    chart = PaceChart.build(first_pace=180, last_pace=600, step=2)
+    chart.save(path)
+
+    loaded = PaceChart.load(path)
+    assert (loaded.first_pace, loaded.step, loaded.rows) == (180, 2, 211)
+    assert loaded.distances == chart.distances == list(calculatormethods.STANDARD_DISTANCES.items())
+    assert list(loaded.table) == list(chart.table)
+    assert loaded.timestamp(300, '1 Mile') == calculatormethods.calculate_time(300, 1.609344) == '00:08:02'
+    assert list(loaded.row(600)) == list(chart.row(600))
+    for pace, name in ((301, '1K'), (602, '1K'), (300, '7K')):
+        with pytest.raises(CalculatorException):
+            loaded.time(pace, name)
+
+    loaded.close()
+    loaded.close()  # closing twice is harmless
+    with pytest.raises(ValueError):
+        loaded.table[0]
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'NOTCHART' + bytes(64))
+    with pytest.raises(CalculatorException):
+        PaceChart.load(str(path))
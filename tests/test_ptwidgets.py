@@ -0,0 +1,19 @@
+"""
+test_ptwidgets.py, values read from the input fields
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import pytest
+
+from app import calculatormethods
+
+
+def test_meters_and_laps_give_a_pace_per_km():
+    pytest.importorskip('PyQt5')
+    from app.ptwidgets import parse_pace_distance
+
+    assert parse_pace_distance('10') == parse_pace_distance('10km') == 10.0
+    assert parse_pace_distance('6.2 mi') == 6.2
+    for text in ('10000m', '25 laps'):
+        assert calculatormethods.calculate_pace(3600, parse_pace_distance(text)) == '00:06:00'
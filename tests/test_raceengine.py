@@ -0,0 +1,47 @@
+"""
+test_raceengine.py, paces and projections of race result files, in input order
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import io
+
+from app import raceengine
+
+LINES = [
+    'Jane Doe,1:00:00,10\n',
+    'John Roe,30:00,5.5\n',
+    'No Time,abc,10\n',
+    'No Distance,1:00:00,far\n',
+    'Slow,3:00:00,1.2\n',
+]
+
+
+def test_projections():
+    output = raceengine.process_chunk(LINES, 42.195, cutoff_in_seconds=7200).splitlines()
+    assert output == [
+        'Jane Doe,1:00:00,10,00:06:00,04:13:10,20.00,',
+        'John Roe,30:00,5.5,00:05:27,03:50:09,22.00,',
+        'No Time,abc,10,,,,INVALID',
+        'No Distance,1:00:00,far,,,,INVALID',
+        'Slow,3:00:00,1.2,02:30:00,105:29:15,INVALID,',  # less than one unit of distance at the cutoff
+    ]
+    assert raceengine.process_chunk(LINES[:1], 42.195) == 'Jane Doe,1:00:00,10,00:06:00,04:13:10,,\n'
+
+
+def test_chunks_are_written_in_input_order(tmp_path):
+    paths = []
+    for number in range(3):
+        path = tmp_path / f'results{number}.csv'
+        path.write_text('athlete,time,distance\n' + ''.join(f'{number}-{line}' for line in LINES * 3))
+        paths.append(str(path))
+
+    outputs = []
+    for workers in (1, 2):
+        output = io.StringIO()
+        raceengine.run(paths, output, 42.195, workers=workers, chunk_size=2, skip_header=True)
+        outputs.append(output.getvalue().splitlines())
+    assert outputs[0] == outputs[1]
+    assert outputs[0][0] == ','.join(raceengine.HEADER)
+    assert [line.split(',')[0] for line in outputs[0][1:]] == [f'{number}-{line.split(",")[0]}'
+                                                               for number in range(3) for line in LINES * 3]
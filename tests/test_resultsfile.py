@@ -0,0 +1,96 @@
+"""
+test_resultsfile.py, round trips through the columnar binary results format
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import io
+import random
+
+import pytest
+
+from app import calculatormethods
+from app.calculatormethods import CalculatorException
+from app.resultsfile import HEADER, MAGIC, SECONDS_MAX, ResultsFile, ResultsWriter, export_csv, import_csv
+
+
+def test_writer_and_load_round_trip(tmp_path):
+    rng = random.Random(2020)
+    rows = [(f'Athlete {index} é', rng.randrange(400000), rng.randrange(1, 500) / 4) for index in range(1000)]
+    path = str(tmp_path / 'results.ptr')
+    with ResultsWriter(path) as writer:
+        for start in range(0, len(rows), 300):  # several chunks
+            names, seconds, distances = zip(*rows[start:start + 300])
+            writer.append(seconds, distances, names)
+
+    with ResultsFile.load(path) as results:
+        assert len(results) == len(rows)
+        assert [results.row(index) for index in range(len(rows))] == rows  # quarters are exact in float32
+        assert results.seconds.obj is results.distances.obj  # both columns are views of the mapped file
+
+
+def test_csv_round_trip(tmp_path):
+    source = 'athlete,time,distance\nJane,1:02:03,15\nBob,45:00,42.195\nbad,xx,3\nshort,1\n,100:00:01,0.1\n'
+    path = str(tmp_path / 'results.ptr')
+    assert import_csv(io.StringIO(source), path, chunk_size=2, skip_header=True) == (3, 2)
+
+    output = io.StringIO()
+    assert export_csv(path, output, chunk_size=2) == 3
+    assert output.getvalue() == 'Jane,01:02:03,15\nBob,00:45:00,42.195\n,100:00:01,0.1\n'
+
+    with ResultsFile.load(path) as results:
+        batch = calculatormethods.calculate_pace_batch(results.seconds, results.distances, formatted=True)
+    assert batch.formatted == ['00:04:08', '00:01:04', '1000:00:10']
+
+
+def test_empty_and_invalid_files(tmp_path):
+    path = str(tmp_path / 'empty.ptr')
+    ResultsWriter(path).close()
+    with ResultsFile.load(path) as results:
+        assert len(results) == 0
+
+    path = tmp_path / 'invalid.ptr'
+    path.write_bytes(b'\0' * HEADER.size)
+    with pytest.raises(CalculatorException):
+        ResultsFile.load(str(path))
+
+
+def test_truncated_files(tmp_path):
+    path = str(tmp_path / 'results.ptr')
+    with ResultsWriter(path) as writer:
+        writer.append([3600, 1800, 900], [10.0, 5.0, 2.5], ['A', 'B', 'C'])
+    with open(path, 'rb') as results_file:
+        data = results_file.read()
+
+    truncated = tmp_path / 'truncated.ptr'
+    for size in (HEADER.size, HEADER.size + 4, len(data) // 2, len(data) - 1):
+        truncated.write_bytes(data[:size])
+        with pytest.raises(CalculatorException, match='Not a results file'):
+            ResultsFile.load(str(truncated))
+    truncated.write_bytes(HEADER.pack(MAGIC, 2 ** 62, 0) + data[HEADER.size:])  # a damaged row count
+    with pytest.raises(CalculatorException, match='Not a results file'):
+        ResultsFile.load(str(truncated))
+
+
+def test_times_beyond_int32_are_skipped(tmp_path):
+    path = str(tmp_path / 'results.ptr')
+    lines = io.StringIO(f'A,1:00:00,10\nB,{SECONDS_MAX + 1},10\nC,{SECONDS_MAX},5\nD,{"9" * 20},5\n')
+    assert import_csv(lines, path) == (2, 2)
+    with ResultsFile.load(path) as results:
+        assert [results.row(index) for index in range(len(results))] == [('A', 3600, 10.0), ('C', SECONDS_MAX, 5.0)]
+
+
+def test_failed_writes_leave_no_file(tmp_path):
+    path = tmp_path / 'results.ptr'
+    with ResultsWriter(str(path)) as writer:
+        writer.append([60], [1.0], ['A'])
+        with pytest.raises(OverflowError):
+            writer.append([60, SECONDS_MAX + 1], [1.0, 1.0], ['B', 'C'])
+        assert (writer.rows, writer.names_length) == (1, 1)  # the chunk that failed is not counted
+    with ResultsFile.load(str(path)) as results:
+        assert [results.row(index) for index in range(len(results))] == [('A', 60, 1.0)]
+
+    with pytest.raises(OverflowError):
+        with ResultsWriter(str(path)) as writer:
+            writer.append([SECONDS_MAX + 1], [1.0], ['A'])
+    assert not path.exists()
@@ -0,0 +1,81 @@
+"""
+test_server.py, kernels, batching and the HTTP front end of the calculation service
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import asyncio
+import json
+
+from app import server
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_kernels_fail_only_the_invalid_rows():
+    assert server.pace_kernel(['1:00:00', 'abc', '9' * 20, '30:00'], [10, 10, 10, 'x']) == [
+        ('00:06:00', None), (None, 'INVALID'), (None, 'INVALID'), (None, 'INVALID')]
+    assert server.distance_kernel(['1:00:00', '1:00'], ['5:00', '5:00']) == [('12.00', None), (None, 'Time < Pace')]
+    assert server.add_kernel([str(2 ** 63 - 1), '45:10'], ['1', '12:00']) == [(None, 'INVALID'), ('00:57:10', None)]
+    assert server.subtract_kernel(['12:00', '45:10'], ['45:10', '12:00']) == [
+        (None, 'Left < Right'), ('00:33:10', None)]
+
+
+def test_a_failing_kernel_only_fails_its_own_request():
+    def kernel(firsts, seconds):
+        if 'boom' in firsts:
+            raise RuntimeError('a bug')
+        return server.add_kernel(firsts, seconds)
+
+    async def submit_all():
+        batcher = server.Batcher(kernel, window=0.001, max_batch=10)
+        return await asyncio.gather(*(batcher.submit(first, '1:00') for first in ('1:00', 'boom', '2:00')))
+
+    assert run(submit_all()) == [('00:02:00', None), (None, 'INVALID'), ('00:03:00', None)]
+
+
+def test_http_requests():
+    async def exchange(requests):
+        calculation_server = server.CalculationServer(window=0.001)
+        listener = await calculation_server.start(port=0)
+        reader, writer = await asyncio.open_connection(*listener.sockets[0].getsockname()[:2])
+        responses = []
+        for request in requests:
+            writer.write(request)
+            head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1')
+            length = int(head.lower().split('content-length:')[1].split('\r\n')[0])
+            responses.append((int(head.split(' ')[1]), json.loads(await reader.readexactly(length))))
+        writer.close()
+        await writer.wait_closed()
+        await asyncio.sleep(0.01)  # the server closes its end of the connection
+        listener.close()
+        await listener.wait_closed()
+        return responses, calculation_server.stats()
+
+    def post(path, payload):
+        body = json.dumps(payload).encode('utf-8')
+        return f'POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n'.encode('latin-1') + body
+
+    responses, stats = run(exchange([
+        post('/pace', {'time': '1:00:00', 'distance': 10}),
+        post('/time', {'pace': '5:00', 'distance': 'far'}),
+        post('/pace', {'time': '1:00:00'}),
+        post('/nowhere', {}),
+        b'GET /pace HTTP/1.1\r\n\r\n',
+        post('/add', {'left': '45:10', 'right': '12:00'}),
+    ]))
+    assert responses == [
+        (200, {'result': '00:06:00'}),
+        (422, {'error': 'INVALID'}),
+        (400, {'error': 'Expected a JSON object with "time" and "distance"'}),
+        (404, {'error': 'Not Found'}),
+        (405, {'error': 'Method Not Allowed'}),
+        (200, {'result': '00:57:10'}),
+    ]
+    assert stats['requests'] == 6
@@ -0,0 +1,37 @@
+"""
+test_splitplanner.py, cumulative splits kept up to date while a plan is changed
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import random
+
+import pytest
+
+from app.calculatormethods import CalculatorException
+from app.splitplanner import SplitPlan
+
+
+def test_elapsed_matches_splits_after_every_change():
+    rng = random.Random(2020)
+    plan = SplitPlan.even(42.195, 300, fade=0.04)
+    assert len(plan) == 43
+    for _ in range(500):
+        index = rng.randrange(len(plan))
+        change = rng.choice((plan.set_pace, plan.set_factor, plan.set_distance))
+        change(index, rng.uniform(0.5, 400))
+        splits = plan.splits()
+        assert [plan.elapsed(index) for index in range(len(plan))] == splits
+        assert plan.total_time() == splits[-1]
+
+
+def test_even_plan():
+    plan = SplitPlan.even(10, 300, segment=2.5)
+    assert plan.timestamps() == ['00:12:30', '00:25:00', '00:37:30', '00:50:00']
+    plan.set_pace(3, 240)
+    assert plan.elapsed(3) == 2850000
+    assert plan.timestamps()[-1] == '00:47:30'
+    with pytest.raises(CalculatorException):
+        plan.elapsed(4)
+    with pytest.raises(CalculatorException):
+        SplitPlan([1.0, 1.0], [300])
@@ -0,0 +1,43 @@
+"""
+test_squadstore.py, columns of a squad kept in step while athletes are added and edited
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import pytest
+
+from app.calculatormethods import CalculatorException
+from app.squadstore import SquadStore
+
+
+def columns(store):
+    return store.names, list(store.times), list(store.paces), list(store.distances), list(store.valid)
+
+
+def test_out_of_range_values_leave_the_store_unchanged():
+    store = SquadStore()
+    store.extend(['a', 'b'], [3600, 1800], [10.0, 0.0])
+    before = columns(store)
+    for times in ([2 ** 63], [-2 ** 63 - 1], [1.5]):
+        with pytest.raises(CalculatorException):
+            store.extend(['c'], times, [5.0])
+    with pytest.raises(CalculatorException):
+        store.extend(['c', 'd'], [60], [5.0])
+    with pytest.raises(CalculatorException):
+        store.set_time(0, 2 ** 63)
+    with pytest.raises(CalculatorException):
+        store.set_pace(0, 2 ** 63)
+    assert columns(store) == before == (['a', 'b'], [3600, 1800], [360, 0], [10.0, 0.0], [1, 0])
+
+
+def test_set_pace_uses_the_time_calculation():
+    store = SquadStore()
+    store.extend(['a', 'b'], [3600, 3600], [10.0, 0.0])
+    store.set_pace(0, 300)
+    assert (store.times[0], store.paces[0], store.valid[0]) == (3000, 300, 1)
+    store.set_pace(0, -300)
+    assert (store.times[0], store.valid[0]) == (0, 0)
+    store.set_pace(1, 300)
+    assert store.valid[1] == 0
+    store.set_time(0, 3600)
+    assert (store.paces[0], store.valid[0]) == (360, 1)
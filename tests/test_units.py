@@ -0,0 +1,85 @@
+"""
+test_units.py, distances and paces in kilometers, miles, meters and laps
+
+Pace & Time Calculator
+Created by Chad Timmermans (www.github.com/chadtimmermans)
+"""
+import random
+
+import pytest
+
+from app import calculatormethods, units
+from app.calculatormethods import CalculatorException
+from app.units import Distance, Pace, parse_distance
+
+CASES = 2000
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('5', Distance(5.0, 'km')),
+    ('5.', Distance(5.0, 'km')),
+    ('.5', Distance(0.5, 'km')),
+    ('42.195', Distance(42.195, 'km')),
+    ('5km', Distance(5.0, 'km')),
+    (' 3.1 mi ', Distance(3.1, 'mi')),
+    ('400m', Distance(400.0, 'm')),
+    ('12 laps', Distance(12.0, 'lap')),
+    ('1 lap', Distance(1.0, 'lap')),
+])
+def test_parse_distance(text, expected):
+    assert parse_distance(text) == expected
+
+
+@pytest.mark.parametrize('text', ['', '.', 'km', '5 miles', '5.5.5', '-5', '5 km 3'])
+def test_parse_distance_rejects(text):
+    with pytest.raises(CalculatorException):
+        parse_distance(text)
+
+
+def test_parse_distance_default_unit():
+    assert parse_distance('10', default='mi') == Distance(10.0, 'mi')
+    assert parse_distance('10', default=None).unit is None
+    assert str(parse_distance('10laps')) == '10lap'
+
+
+def test_conversions_round_trip():
+    rng = random.Random(2020)
+    for _ in range(CASES):
+        source, target = rng.choice(list(units.UNITS)), rng.choice(list(units.UNITS))
+        distance = Distance(rng.randrange(1, 100000) / 100, source)
+        assert distance.to(target).to(source).value == pytest.approx(distance.value)
+        pace = Pace(rng.randrange(60, 900), source)
+        assert pace.to(target).seconds * distance.to(target).value == pytest.approx(pace.seconds * distance.value)
+    assert Distance(1, 'mi').to('m').value == pytest.approx(1609.344)
+    assert Distance(4, 'lap').to('km').value == pytest.approx(1.6)
+
+
+def test_batches_match_the_calculations_in_km():
+    rng = random.Random(2020)
+    times = [rng.randrange(600, 30000) for _ in range(CASES)]
+    paces = [rng.randrange(120, 600) for _ in range(CASES)]
+    distances = [rng.randrange(0, 500) / 10 for _ in range(CASES)]
+
+    batches = [
+        (calculatormethods.calculate_pace_batch(times, distances),
+         units.calculate_pace_units(times, distances, out_units=('km',))['km']),
+        (calculatormethods.calculate_time_batch(paces, distances),
+         units.calculate_time_units(paces, 'km', distances, 'km')),
+        (calculatormethods.calculate_distance_batch(times, paces),
+         units.calculate_distance_units(times, paces, out_units=('km',))['km']),
+    ]
+    for km, result in batches:
+        assert result.valid == km.valid
+        assert result.values == km.values  # rounded the same way, to the last digit
+
+
+def test_batches_convert_units():
+    per_mile = units.calculate_pace_units([3600], [10.0], unit='mi')
+    assert per_mile['mi'].values[0] == 360
+    assert per_mile['km'].values[0] == round(360 / 1.609344)
+    assert units.calculate_time_units([300], 'km', [5.0], 'mi').values[0] == int(5 * 1.609344 * 300)
+    distances = units.calculate_distance_units([3600], [300], pace_unit='km')
+    assert distances['m'].values[0] == 12000.0
+    assert distances['lap'].values[0] == 30.0
+    assert not units.calculate_pace_units([3600], [0.0])['km'].valid[0]
+    assert not units.calculate_distance_units([100], [300])['km'].valid[0]